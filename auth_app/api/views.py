@@ -1,10 +1,10 @@
 from django.utils import timezone
-from rest_framework.authtoken.models import Token
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
 from .serializers import RegistrationSerializer, LoginSerializer
+from auth_app.authentication import issue_token
 
 """Handles user registration and token creation."""
 class RegistrationView(APIView):
@@ -16,7 +16,7 @@ class RegistrationView(APIView):
 
         if serializer.is_valid():
             saved_account = serializer.save()
-            token, created = Token.objects.get_or_create(user=saved_account)
+            token = issue_token(saved_account)
             data = {
                 'token': token.key,
                 'username': saved_account.username,
@@ -31,7 +31,7 @@ class RegistrationView(APIView):
 class LoginView(APIView):
     permission_classes = [AllowAny]
 
-    # Authenticate user and return token.
+    # Authenticate user and return token (a new one once the old has expired or is due for rotation).
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
@@ -39,7 +39,7 @@ class LoginView(APIView):
             login_user.last_login = timezone.now()
             login_user.save(update_fields=['last_login'])
 
-            token, created = Token.objects.get_or_create(user=login_user)
+            token = issue_token(login_user)
             data = {
                 'token': token.key,
                 'username': login_user.username,
@@ -0,0 +1,47 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from .cache import cache_token, get_cached_token
+
+# Whether a token is older than the given number of hours (0 disables the check).
+def token_older_than(token, hours):
+    return bool(hours) and token.created < timezone.now() - timedelta(hours=hours)
+
+# Whether a token has passed AUTH_TOKEN_TTL_HOURS.
+def token_expired(token):
+    return token_older_than(token, settings.AUTH_TOKEN_TTL_HOURS)
+
+# Return the user's token, replacing it when it has expired or is older than AUTH_TOKEN_ROTATE_AFTER_HOURS.
+def issue_token(user):
+    token, created = Token.objects.get_or_create(user=user)
+    if not created and (token_expired(token) or token_older_than(token, settings.AUTH_TOKEN_ROTATE_AFTER_HOURS)):
+        token.delete()
+        token, created = Token.objects.get_or_create(user=user)
+    return token
+
+"""
+TokenAuthentication that answers repeat requests from a bounded in-process LRU and, with a shared cache
+backend, the shared cache instead of the Token + Account query; the password hash is never cached. Entries are invalidated when a token is deleted or its account
+changes (see auth_app.signals); expired tokens are deleted and rejected.
+"""
+class CachedTokenAuthentication(TokenAuthentication):
+
+    # Resolve the token from the caches, loading and caching it on a miss.
+    def authenticate_credentials(self, key):
+        token = get_cached_token(key)
+        if token is None:
+            token = self.get_model().objects.select_related('user').filter(key=key).first()
+            if token is None:
+                raise AuthenticationFailed('Invalid token.')
+            cache_token(token)
+
+        if not token.user.is_active:
+            raise AuthenticationFailed('User inactive or deleted.')
+        if token_expired(token):
+            token.delete()
+            raise AuthenticationFailed('Token has expired.')
+
+        return (token.user, token)
@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+from hashlib import sha256
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework.authtoken.models import Token
+
+"""Bounded, thread-safe in-process LRU whose entries expire after a fixed number of seconds."""
+class LocalTTLCache:
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    # Return the value of a live entry (marking it recently used), or None.
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    # Store a value, evicting the least recently used entries beyond max_size.
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    # Drop an entry if present.
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    # Drop all entries.
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+_local_tokens = None
+
+# Return the lazily created in-process token cache (one per worker process).
+def get_local_token_cache():
+    global _local_tokens
+    if _local_tokens is None:
+        _local_tokens = LocalTTLCache(settings.AUTH_TOKEN_LOCAL_CACHE_SIZE, settings.AUTH_TOKEN_LOCAL_CACHE_TIMEOUT)
+    return _local_tokens
+
+# Cache key of a token; a digest, so raw tokens never reach the cache backend.
+def token_cache_key(key):
+    return f'auth:token:{sha256(key.encode()).hexdigest()}'
+
+"""Cache backends that are not shared between worker processes; with them only the local tier is used."""
+PROCESS_LOCAL_CACHE_BACKENDS = (LocMemCache, DummyCache)
+
+"""Account columns never written to a cache; they stay deferred on the rebuilt user."""
+TOKEN_CACHE_EXCLUDED_FIELDS = {'password'}
+
+# Return the shared cache tier, or None when the default backend only lives in this process.
+def get_shared_token_cache():
+    shared = caches['default']
+    return None if isinstance(shared, PROCESS_LOCAL_CACHE_BACKENDS) else shared
+
+# Plain snapshot of a token and the account columns requests read (no password hash).
+def token_snapshot(token):
+    user = token.user
+    fields = [field.attname for field in user._meta.concrete_fields if field.attname not in TOKEN_CACHE_EXCLUDED_FIELDS]
+    return {
+        'created': token.created,
+        'user': {'fields': fields, 'values': [getattr(user, name) for name in fields]},
+    }
+
+# Build a fresh token and user from a snapshot, so a request can never change cached objects.
+def token_from_snapshot(key, snapshot):
+    user_model = get_user_model()
+    user = user_model.from_db(user_model.objects.db, snapshot['user']['fields'], snapshot['user']['values'])
+    token = Token.from_db(Token.objects.db, ['key', 'user_id', 'created'], [key, user.pk, snapshot['created']])
+    token.user = user
+    return token
+
+# Look a token (with its user) up in the local LRU, then in the shared cache; None on a miss.
+def get_cached_token(key):
+    cache_key = token_cache_key(key)
+    local = get_local_token_cache()
+    snapshot = local.get(cache_key)
+    if snapshot is None:
+        shared = get_shared_token_cache()
+        snapshot = shared.get(cache_key) if shared is not None else None
+        if snapshot is None:
+            return None
+        local.set(cache_key, snapshot)
+    return token_from_snapshot(key, snapshot)
+
+# Store a token with its user in both cache tiers.
+def cache_token(token):
+    cache_key = token_cache_key(token.key)
+    snapshot = token_snapshot(token)
+    shared = get_shared_token_cache()
+    if shared is not None:
+        shared.set(cache_key, snapshot, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+    get_local_token_cache().set(cache_key, snapshot)
+
+# Remove a token from the shared cache and this process's LRU; other processes drop it within
+# AUTH_TOKEN_LOCAL_CACHE_TIMEOUT.
+def invalidate_token(key):
+    cache_key = token_cache_key(key)
+    shared = get_shared_token_cache()
+    if shared is not None:
+        shared.delete(cache_key)
+    get_local_token_cache().delete(cache_key)
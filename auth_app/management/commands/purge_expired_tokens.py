@@ -0,0 +1,24 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+"""Delete authentication tokens that have passed their lifetime."""
+class Command(BaseCommand):
+    help = "Delete tokens older than AUTH_TOKEN_TTL_HOURS (or --older-than-hours)."
+
+    # Register command line options.
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-hours', type=int, default=settings.AUTH_TOKEN_TTL_HOURS, help="Age in hours after which tokens are deleted.")
+
+    # Delete the expired tokens; their cache entries are dropped by the post_delete signal.
+    def handle(self, *args, **options):
+        hours = options['older_than_hours']
+        if not hours:
+            self.stdout.write("Token expiry is disabled (AUTH_TOKEN_TTL_HOURS=0); no tokens deleted.")
+            return
+
+        cutoff = timezone.now() - timedelta(hours=hours)
+        deleted, _ = Token.objects.filter(created__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired tokens."))
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("auth_app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="account",
+            index=models.Index(
+                condition=models.Q(("user_type__isnull", False)),
+                fields=["user_type", "date_joined"],
+                name="account_type_joined",
+            ),
+        ),
+    ]
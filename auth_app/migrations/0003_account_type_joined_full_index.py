@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-18 21:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("auth_app", "0002_account_user_type_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="account",
+            name="account_type_joined",
+        ),
+        migrations.AddIndex(
+            model_name="account",
+            index=models.Index(
+                fields=["user_type", "date_joined"], name="account_type_joined"
+            ),
+        ),
+    ]
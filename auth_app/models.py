@@ -17,6 +17,12 @@ class Account(AbstractUser):
 
     user_type = models.CharField(max_length=10, choices=USER_TYPE_CHOICES, null=True, blank=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Filtering by type and ordering by join date; nearly every account has a type, so a partial index would not be smaller.
+            models.Index(fields=['user_type', 'date_joined'], name='account_type_joined'),
+        ]
+
     def clean(self):
         if not self.is_superuser and not self.is_staff and not self.user_type:
             raise ValidationError({'user_type': 'This field is required for regular users.'})
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from auth_app.cache import invalidate_token
+from auth_app.models import Account
+
+"""Account fields whose changes do not affect authentication (written on every login)."""
+AUTH_IGNORED_ACCOUNT_FIELDS = {'last_login'}
+
+# A deleted (or rotated) token must stop authenticating at once.
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+# Account changes (deactivation, role, names) drop the cached token so the next request loads the current account.
+# A new password (set_password keeps the raw value until save completes) revokes the account's tokens.
+@receiver(post_save, sender=Account)
+def invalidate_account_tokens(sender, instance, created=False, update_fields=None, **kwargs):
+    if not created and instance._password is not None:
+        Token.objects.filter(user=instance).delete()
+        return
+    if created or (update_fields is not None and set(update_fields) <= AUTH_IGNORED_ACCOUNT_FIELDS):
+        return
+    for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+        invalidate_token(key)
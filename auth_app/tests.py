@@ -0,0 +1,57 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from auth_app.cache import get_local_token_cache
+from auth_app.models import Account
+
+"""Cached tokens skip the token query but stop authenticating as soon as the token or the account changes."""
+class CachedTokenAuthenticationTests(TestCase):
+
+    def setUp(self):
+        get_local_token_cache().clear()
+        self.account = Account.objects.create_user(username='customer', password='secret-pw-123', user_type=Account.CUSTOMER)
+        self.token = Token.objects.create(user=self.account)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    # Status code of an authenticated request.
+    def request_status(self):
+        return self.client.get('/api/orders/').status_code
+
+    def test_cached_request_skips_the_token_query(self):
+        self.assertEqual(self.request_status(), 200)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.request_status(), 200)
+        self.assertFalse([query for query in queries.captured_queries if 'authtoken_token' in query['sql']])
+
+    def test_deleted_token_is_rejected_while_cached(self):
+        self.assertEqual(self.request_status(), 200)
+        self.token.delete()
+        self.assertEqual(self.request_status(), 401)
+
+    def test_deactivated_account_is_rejected_while_cached(self):
+        self.assertEqual(self.request_status(), 200)
+        self.account.is_active = False
+        self.account.save()
+        self.assertEqual(self.request_status(), 401)
+
+    def test_password_change_revokes_the_tokens(self):
+        self.assertEqual(self.request_status(), 200)
+        self.account.set_password('new-secret-pw-456')
+        self.account.save()
+
+        self.assertEqual(self.request_status(), 401)
+        self.assertFalse(Token.objects.filter(user=self.account).exists())
+
+        login = APIClient().post('/api/login/', {'username': 'customer', 'password': 'new-secret-pw-456'}, format='json')
+        self.assertEqual(login.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {login.data['token']}")
+        self.assertEqual(self.request_status(), 200)
+
+    def test_login_bookkeeping_keeps_the_token(self):
+        self.assertEqual(self.request_status(), 200)
+        self.account.save(update_fields=['last_login'])
+        self.assertEqual(self.request_status(), 200)
+        self.assertTrue(Token.objects.filter(key=self.token.key).exists())
@@ -2,35 +2,24 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
+from django.utils.cache import patch_cache_control
 from .serializers import BaseInfoSerializer
-from auth_app.models import Account
-from offers_app.models import Offer
-from reviews_app.models import Review
+from base_info_app.cache import get_platform_stats
 
 """Provides base statistics for the platform."""
 class BaseInfoView(APIView):
     permission_classes = [AllowAny]
+    authentication_classes = []
        
-    # Return review, rating, business profile, and offer counts.
+    # Return review, rating, business profile, and offer counts from the cached snapshot; shared caches may keep it too.
     def get(self, request):
         try:
-            review_count = Review.objects.count()
-            rating_list = Review.objects.values_list('rating', flat=True)
-            business_user_count = Account.objects.filter(user_type=Account.BUSINESS).count()
-            offer_count = Offer.objects.count() 
-
-            average_rating = sum(rating_list) / len(rating_list) if rating_list else 0.0
-
-            serializer = BaseInfoSerializer(
-                    {
-                        'review_count': review_count,
-                        'average_rating': average_rating,
-                        'business_profile_count': business_user_count,
-                        'offer_count': offer_count 
-                    }, 
-                    context={'request': request}
-                )
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            serializer = BaseInfoSerializer(get_platform_stats(), context={'request': request})
+            response = Response(serializer.data, status=status.HTTP_200_OK)
         
         except Exception as e:
-            return Response({"detail": f"An error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({"detail": f"An error occurred: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        patch_cache_control(response, public=True, max_age=settings.PLATFORM_STATS_CACHE_TIMEOUT)
+        return response
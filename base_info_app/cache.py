@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.cache import cache
+from base_info_app.models import PlatformStats
+
+PLATFORM_STATS_KEY = 'platform:stats'
+
+# Return the platform statistics payload from the cache, falling back to the stored snapshot.
+def get_platform_stats():
+    data = cache.get(PLATFORM_STATS_KEY)
+    if data is None:
+        data = stats_payload(PlatformStats.objects.current(settings.PLATFORM_STATS_MAX_AGE))
+        cache.set(PLATFORM_STATS_KEY, data, settings.PLATFORM_STATS_CACHE_TIMEOUT)
+    return data
+
+# Recompute the snapshot and replace the cached payload.
+def refresh_platform_stats():
+    data = stats_payload(PlatformStats.objects.refresh())
+    cache.set(PLATFORM_STATS_KEY, data, settings.PLATFORM_STATS_CACHE_TIMEOUT)
+    return data
+
+# Plain values of a snapshot as the BaseInfoSerializer expects them.
+def stats_payload(stats):
+    return {
+        'review_count': stats.review_count,
+        'average_rating': stats.average_rating,
+        'business_profile_count': stats.business_profile_count,
+        'offer_count': stats.offer_count,
+    }
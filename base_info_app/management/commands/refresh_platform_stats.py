@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from base_info_app.cache import refresh_platform_stats
+
+"""Recompute the platform statistics snapshot; meant to run periodically (e.g. from cron)."""
+class Command(BaseCommand):
+    help = "Recompute the platform statistics shown by /api/base-info/ and refresh the cached copy."
+
+    # Refresh the snapshot and report it.
+    def handle(self, *args, **options):
+        data = refresh_platform_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"Platform stats refreshed: {data['review_count']} reviews, {data['business_profile_count']} business profiles, {data['offer_count']} offers."
+        ))
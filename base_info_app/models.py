@@ -0,0 +1,51 @@
+from datetime import timedelta
+from django.db import models
+from django.db.models import Sum
+from django.utils import timezone
+from auth_app.models import Account
+from offers_app.models import Offer
+from reviews_app.models import BusinessRatingSummary
+
+"""Queryset helpers for the platform statistics snapshot."""
+class PlatformStatsQuerySet(models.QuerySet):
+
+    # Recompute the snapshot with database aggregates and store it.
+    def refresh(self):
+        ratings = BusinessRatingSummary.objects.aggregate(review_count=Sum('review_count'), rating_sum=Sum('rating_sum'))
+        stats, _ = self.update_or_create(pk=PlatformStats.SINGLETON_ID, defaults={
+            'review_count': ratings['review_count'] or 0,
+            'rating_sum': ratings['rating_sum'] or 0,
+            'business_profile_count': Account.objects.filter(user_type=Account.BUSINESS).count(),
+            'offer_count': Offer.objects.count(),
+            'computed_at': timezone.now(),
+        })
+        return stats
+
+    # Return the stored snapshot, recomputing it when it is missing or older than max_age seconds.
+    def current(self, max_age):
+        stats = self.filter(pk=PlatformStats.SINGLETON_ID).first()
+        if stats is None or stats.computed_at < timezone.now() - timedelta(seconds=max_age):
+            stats = self.refresh()
+        return stats
+
+
+"""Single-row snapshot of the platform statistics shown on the landing page."""
+class PlatformStats(models.Model):
+    SINGLETON_ID = 1
+
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveBigIntegerField(default=0)
+    business_profile_count = models.PositiveIntegerField(default=0)
+    offer_count = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    objects = PlatformStatsQuerySet.as_manager()
+
+    # Return when the snapshot was computed.
+    def __str__(self):
+        return f'Platform stats of {self.computed_at:%Y-%m-%d %H:%M:%S}'
+
+    # Average rating over all reviews (0.0 without reviews).
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.review_count if self.review_count else 0.0
@@ -0,0 +1,43 @@
+from calendar import timegm
+from functools import wraps
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, quote_etag
+
+# Build a strong ETag from a modification timestamp (microsecond precision).
+def timestamp_etag(timestamp):
+    if timestamp is None:
+        return None
+    return quote_etag(format(int(timestamp.timestamp() * 1_000_000), 'x'))
+
+# Whether an If-Match header value matches the current ETag ('*' matches any existing resource).
+def if_match_satisfied(header, etag):
+    etags = parse_etags(header)
+    return '*' in etags or etag in etags
+
+"""
+Decorator for APIView GET handlers: looks up the resource's modification timestamp with a cheap
+single-column query (timestamp_lookup receives the URL kwargs) and answers If-None-Match /
+If-Modified-Since with 304 before the handler and its serializer run.
+"""
+def conditional_get(timestamp_lookup):
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            timestamp = timestamp_lookup(**kwargs)
+            if timestamp is None:
+                return method(view, request, *args, **kwargs)
+
+            etag = timestamp_etag(timestamp)
+            last_modified = timegm(timestamp.utctimetuple())
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response.headers['ETag'] = etag
+            response.headers['Last-Modified'] = http_date(last_modified)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,84 @@
+import csv
+import datetime
+import decimal
+import json
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+"""Supported export formats and their content types."""
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+"""
+Mixin for views that stream exports chosen with ?format=csv|ndjson. DRF treats the format parameter
+as a renderer override and would answer 404 for formats without a renderer, so negotiation is forced
+to fall back to the default renderer (used for error responses only).
+"""
+class ExportMixin:
+
+    # Never fail content negotiation because of the format query parameter.
+    def perform_content_negotiation(self, request, force=False):
+        return super().perform_content_negotiation(request, force=True)
+
+
+"""Write-only file object for csv.writer that hands each formatted line back to the caller."""
+class Echo:
+
+    # Return the value instead of buffering it.
+    def write(self, value):
+        return value
+
+
+# Return the requested export format (default csv), or None when it is not supported.
+def get_export_format(request):
+    export_format = request.query_params.get('format', 'csv').lower()
+    return export_format if export_format in EXPORT_FORMATS else None
+
+
+# Stream rows from a server-side cursor; values_list() querysets keep per-row overhead to a tuple.
+def iterate_rows(queryset):
+    return queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+"""Leading characters that make spreadsheet applications evaluate a cell as a formula."""
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+# Flatten a value into a CSV cell; text that a spreadsheet would run as a formula is prefixed with '.
+def csv_cell(value):
+    if isinstance(value, str):
+        return f"'{value}" if value.startswith(CSV_FORMULA_PREFIXES) else value
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+# Yield a header line and one CSV line per row.
+def csv_lines(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([csv_cell(value) for value in row])
+
+
+# Yield one JSON object per row and line.
+def ndjson_lines(columns, rows):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+# Build a streaming download of the rows (tuples in column order) in the given format.
+def stream_export(rows, columns, export_format, filename):
+    lines = csv_lines(columns, rows) if export_format == 'csv' else ndjson_lines(columns, rows)
+    response = StreamingHttpResponse(lines, content_type=EXPORT_FORMATS[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    response['Cache-Control'] = 'no-store'
+    return response
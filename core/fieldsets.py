@@ -0,0 +1,142 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import serializers
+
+# Read the sparse fieldset of a request: ?fields=a,b selects fields, ?omit=c,d drops them.
+def sparse_fieldset(request):
+    fieldset = {}
+    for param in ('fields', 'omit'):
+        value = request.query_params.get(param)
+        if value:
+            fieldset[param] = [name.strip() for name in value.split(',') if name.strip()]
+    return fieldset
+
+
+# Field paths of ordering keys such as '-updated_at', for prune_queryset(required=...) when cursor values are read.
+def ordering_paths(keys):
+    return [key.lstrip('-') for key in keys]
+
+
+"""
+Serializer mixin for sparse fieldsets: the fields= and omit= keyword arguments drop unrequested fields
+(unknown names are ignored), so their SerializerMethodFields and nested serializers never run.
+prune_queryset() then loads only the columns, joins and prefetches the remaining fields need.
+SerializerMethodFields declare what they read in Meta.field_dependencies ({'field': ['path', ...]});
+without a declaration the columns are not pruned.
+"""
+class DynamicFieldsMixin:
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        omit = kwargs.pop('omit', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+    # Restrict a queryset to what the selected fields read; required are extra lookups (e.g. cursor keys).
+    def prune_queryset(self, queryset, required=()):
+        plan = QueryPlan(queryset.model)
+        dependencies = getattr(getattr(self, 'Meta', None), 'field_dependencies', {})
+        prunable = True
+
+        for name, field in self.fields.items():
+            if name in dependencies:
+                for path in dependencies[name]:
+                    plan.add(path)
+            elif field.source == '*':
+                prunable = False
+            else:
+                plan.add(field.source, field=field)
+        for path in required:
+            plan.add(path)
+
+        return plan.apply(queryset, prunable)
+
+
+# Sources read by a nested single-object serializer, or None when it needs the whole related object.
+def nested_sources(field):
+    if not isinstance(field, serializers.Serializer):
+        return None
+    sources = [child.source for child in field.fields.values()]
+    return None if '*' in sources else sources
+
+
+"""Columns (only), joins (select_related) and prefetches collected for a model's serializer fields."""
+class QueryPlan:
+    def __init__(self, model):
+        self.model = model
+        self.only = {model._meta.pk.name}
+        self.whole = set()
+        self.select = set()
+        self.prefetch = {}
+
+    # Plan one dotted or __ separated source path.
+    def add(self, path, field=None):
+        parts = path.replace('.', LOOKUP_SEP).split(LOOKUP_SEP)
+        opts = self.model._meta
+        for index, name in enumerate(parts):
+            try:
+                model_field = opts.get_field(name)
+            except FieldDoesNotExist:
+                return
+            lookup = LOOKUP_SEP.join(parts[:index + 1])
+            last = index == len(parts) - 1
+
+            # A foreign key column named by its attname (e.g. user_id) is read without a join.
+            if model_field.concrete and name == model_field.attname != model_field.name:
+                self.only.add(LOOKUP_SEP.join(parts[:index] + [model_field.name]))
+                return
+            if model_field.many_to_many or model_field.one_to_many:
+                self.add_prefetch(lookup, model_field, field if last else None)
+                return
+            if not model_field.is_relation:
+                self.only.add(lookup)
+                return
+            if last:
+                # A primary key field only needs the foreign key column; anything else reads the related object.
+                if isinstance(field, serializers.RelatedField) and model_field.concrete:
+                    self.only.add(lookup)
+                    return
+                self.select.add(lookup)
+                nested = nested_sources(field)
+                if nested is None:
+                    self.only.add(lookup)
+                    self.whole.add(lookup)
+                for source in nested or ():
+                    self.add(f'{lookup}{LOOKUP_SEP}{source}')
+                return
+            self.select.add(lookup)
+            opts = model_field.related_model._meta
+
+    # Prefetch a to-many relation, pruned by the nested serializer when it supports sparse fieldsets.
+    def add_prefetch(self, lookup, model_field, field):
+        child = getattr(field, 'child', None)
+        if LOOKUP_SEP in lookup or not isinstance(child, DynamicFieldsMixin) or not model_field.one_to_many:
+            self.prefetch.setdefault(lookup, lookup)
+            return
+        related = model_field.related_model._default_manager.all()
+        self.prefetch[lookup] = Prefetch(lookup, queryset=child.prune_queryset(related, required=[model_field.field.attname]))
+
+    # Columns for only(); paths inside a relation that is loaded as a whole object are left out, since
+    # listing them would defer the relation's other columns and load each one with an extra query.
+    def only_fields(self):
+        return sorted(
+            path for path in self.only
+            if not any(path.startswith(f'{relation}{LOOKUP_SEP}') for relation in self.whole)
+        )
+
+    # Apply the plan, replacing any joins and prefetches the queryset already had.
+    def apply(self, queryset, prunable):
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if self.select:
+            queryset = queryset.select_related(*sorted(self.select))
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*self.prefetch.values())
+        if prunable:
+            queryset = queryset.only(*self.only_fields())
+        return queryset
@@ -0,0 +1,139 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+"""Resized variants generated for uploaded images: name -> (max width, max height)."""
+IMAGE_VARIANTS = {
+    'thumb': (160, 160),
+    'card': (480, 360),
+    'full': (1600, 1600),
+}
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff'}
+
+_executor = None
+
+# Return the lazily created worker pool (created per process, so it is safe with forking servers).
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.IMAGE_VARIANT_WORKERS)
+    return _executor
+
+# Whether a stored file name looks like an image we can resize.
+def is_image_name(name):
+    return os.path.splitext(name or '')[1].lower() in IMAGE_EXTENSIONS
+
+# Storage name of a variant, e.g. offer_images/logo.png -> offer_images/variants/logo_thumb.webp.
+def variant_name(name, variant):
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'variants', f'{stem}_{variant}.webp')
+
+# Model column recording the variants generated for a file field, e.g. image -> image_variant_set.
+def variant_set_field(field_name):
+    return f'{field_name}_variant_set'
+
+# Variants recorded for the file a field currently holds; empty when they were made for an earlier file.
+def recorded_variants(field_file):
+    recorded = getattr(field_file.instance, variant_set_field(field_file.field.name), None) or {}
+    return recorded.get('variants', []) if recorded.get('source') == field_file.name else []
+
+# Store on the model row which variants exist for its file, unless the row holds another file by now.
+# The row's auto_now timestamps (the ETag validators, e.g. updated_at) move too, so cached copies without
+# the variants stop revalidating.
+def record_variants(field_file, variants):
+    instance, field_name = field_file.instance, field_file.field.name
+    model = type(instance)
+    now = timezone.now()
+    touched = {field.name: now for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)}
+    model._default_manager.filter(pk=instance.pk, **{field_name: field_file.name}).update(
+        **{variant_set_field(field_name): {'source': field_file.name, 'variants': list(variants)}}, **touched
+    )
+
+# Map variant names to URLs for the recorded variants (no storage lookups); empty while processing or for non-images.
+def variant_urls(field_file, request=None):
+    if not field_file or not is_image_name(field_file.name):
+        return {}
+
+    urls = {}
+    for variant in recorded_variants(field_file):
+        url = field_file.storage.url(variant_name(field_file.name, variant))
+        urls[variant] = request.build_absolute_uri(url) if request is not None else url
+    return urls
+
+# Whether the file at path is an image Pillow can read (the check ImageField runs on regular uploads).
+def is_valid_image(path):
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            image.verify()
+    except Exception:
+        return False
+    return True
+
+# Resize one image into all variants; runs in a worker process and only uses Pillow.
+def render_variants(source_path, targets):
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        for target_path, size in targets:
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            variant = image.copy()
+            variant.thumbnail(size, Image.LANCZOS)
+            tmp_path = f'{target_path}.tmp'
+            variant.save(tmp_path, 'WEBP', quality=80, method=4)
+            os.replace(tmp_path, target_path)
+    return [target_path for target_path, _ in targets]
+
+# Resolve the filesystem targets of a stored image, or None when it cannot be processed locally.
+def variant_targets(field_file):
+    if not field_file or not is_image_name(field_file.name):
+        return None
+    try:
+        source_path = field_file.storage.path(field_file.name)
+    except NotImplementedError:
+        logger.warning("Storage of %s has no local path; skipping image variants.", field_file.name)
+        return None
+
+    targets = [
+        (field_file.storage.path(variant_name(field_file.name, variant)), size)
+        for variant, size in IMAGE_VARIANTS.items()
+    ]
+    return source_path, targets
+
+# Submit variant generation to the worker pool; on_done runs in this process after a successful job.
+def submit_variants(field_file, on_done=None):
+    resolved = variant_targets(field_file)
+    if resolved is None:
+        return None
+    future = get_executor().submit(render_variants, *resolved)
+    future.add_done_callback(lambda done: _finish(done, field_file, on_done))
+    return future
+
+# Generate variants in the background once the surrounding transaction has committed.
+def schedule_variants(field_file, on_done=None):
+    if field_file and is_image_name(field_file.name):
+        transaction.on_commit(lambda: submit_variants(field_file, on_done))
+
+# Log errors of background variant jobs, or record the variants and run the completion hook.
+def _finish(future, field_file, on_done):
+    error = future.exception()
+    if error is not None:
+        logger.error("Generating image variants failed: %s", error)
+        return
+    try:
+        record_variants(field_file, IMAGE_VARIANTS)
+    finally:
+        # Callbacks run on the pool's management thread; do not keep its connection open.
+        connections.close_all()
+    if on_done is not None:
+        on_done()
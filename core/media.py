@@ -0,0 +1,160 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+from django.conf import settings
+from django.core.exceptions import PermissionDenied, SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+"""Bytes read per iteration when Django streams a byte range itself."""
+MEDIA_CHUNK_SIZE = 64 * 1024
+
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+"""Media prefixes that stay public under authenticated_profile_media (offer images and their variants)."""
+PUBLIC_MEDIA_PREFIXES = ('offer_images/',)
+
+# Default MEDIA_ACCESS_POLICY: every file is public and may be kept by shared caches.
+def public_media(request, path):
+    return 'public'
+
+# MEDIA_ACCESS_POLICY for private profile files: offer images stay public, other files (profile uploads)
+# are only sent to authenticated users and never kept by shared caches.
+def authenticated_profile_media(request, path):
+    if path.startswith(PUBLIC_MEDIA_PREFIXES):
+        return 'public'
+    return 'private' if media_user(request).is_authenticated else None
+
+# The user of a media request, authenticated like the API (token header); anonymous on missing or bad credentials.
+def media_user(request):
+    api_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        return api_request.user
+    except APIException:
+        # Failed authentication leaves the request anonymous.
+        return api_request.user
+
+# Resolve a media path to an existing regular file inside MEDIA_ROOT; hidden files and traversal attempts are 404.
+def resolve_media_path(path):
+    if any(part.startswith('.') for part in path.split('/')):
+        raise Http404("File not found.")
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("File not found.")
+    if not os.path.isfile(full_path):
+        raise Http404("File not found.")
+    return full_path
+
+# ETag from the file's modification time and size, in nginx's format so validators match after a hand-off.
+def file_etag(stat):
+    return quote_etag(f'{int(stat.st_mtime):x}-{stat.st_size:x}')
+
+# Parse a single-range Range header: (start, end) inclusive, None to send the whole file
+# (no, malformed or multi-range header), or False when the range cannot be satisfied.
+def parse_range(header, size):
+    match = RANGE_PATTERN.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        suffix = int(last)
+        if suffix == 0:
+            return False
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return False
+    return start, min(int(last), size - 1) if last else size - 1
+
+# Yield length bytes of the file starting at start.
+def read_range(full_path, start, length):
+    with open(full_path, 'rb') as media_file:
+        media_file.seek(start)
+        while length > 0:
+            data = media_file.read(min(MEDIA_CHUNK_SIZE, length))
+            if not data:
+                return
+            length -= len(data)
+            yield data
+
+# Hand the file off to the front proxy; it sends the body and answers Range requests itself.
+def offload_response(full_path, path):
+    response = HttpResponse()
+    if settings.MEDIA_SERVING == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX.rstrip('/') + '/' + quote(path)
+    else:
+        response['X-Sendfile'] = full_path
+    return response
+
+# Send the file (or the requested byte range) from this process.
+def local_response(request, full_path, size, etag, last_modified):
+    byte_range = parse_range(request.headers.get('Range'), size)
+    # A Range with a stale If-Range validator gets the whole current file.
+    if_range = request.headers.get('If-Range')
+    if byte_range is not None and if_range and if_range not in (etag, http_date(last_modified)):
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if request.method == 'HEAD':
+        response = HttpResponse()
+        response['Content-Length'] = str(size)
+        return response
+    if byte_range is None:
+        # FileResponse lets the server use wsgi.file_wrapper (sendfile) for the whole file.
+        return FileResponse(open(full_path, 'rb'))
+
+    start, end = byte_range
+    response = StreamingHttpResponse(read_range(full_path, start, end - start + 1), status=206)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(end - start + 1)
+    return response
+
+"""
+Serve a file from MEDIA_ROOT. Django only checks access (MEDIA_ACCESS_POLICY), the path and the
+conditional headers (304/412); with MEDIA_SERVING=x-accel-redirect (nginx) or x-sendfile (Apache,
+lighttpd) the front proxy sends the bytes, otherwise they are streamed in-process with Range support
+as a development fallback. The policy returns 'public', 'private' (no shared caching) or None (403).
+"""
+@require_safe
+def serve_media(request, path):
+    scope = import_string(settings.MEDIA_ACCESS_POLICY)(request, path)
+    if scope is None:
+        raise PermissionDenied("Authentication is required for this file.")
+    full_path = resolve_media_path(path)
+    stat = os.stat(full_path)
+    etag = file_etag(stat)
+    last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        if settings.MEDIA_SERVING == 'django':
+            response = local_response(request, full_path, stat.st_size, etag, last_modified)
+        else:
+            response = offload_response(full_path, path)
+        if response.status_code != 416:
+            content_type, encoding = mimetypes.guess_type(full_path)
+            response['Content-Type'] = content_type or 'application/octet-stream'
+            if encoding:
+                response['Content-Encoding'] = encoding
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = f'{scope}, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+    return response
@@ -0,0 +1,225 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist, ValidationError
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.utils.urls import replace_query_param
+
+"""Raised when a cursor token cannot be decoded or does not match the ordering."""
+class InvalidCursor(ValueError):
+    pass
+
+
+"""One page of a keyset paginated queryset."""
+class CursorPage:
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    # Iterate over the objects of the page.
+    def __iter__(self):
+        return iter(self.object_list)
+
+    # Return the number of objects on the page.
+    def __len__(self):
+        return len(self.object_list)
+
+
+"""
+Keyset (cursor) paginator: orders the queryset by the given keys (e.g. ('-updated_at', '-id'))
+and seeks past the last seen row instead of using OFFSET, so no COUNT(*) is needed and deep pages stay fast.
+The last key must be unique. Nullable keys sort their NULLs last.
+"""
+class CursorPaginator:
+    def __init__(self, queryset, ordering, page_size):
+        self.queryset = queryset
+        self.page_size = page_size
+        self.keys = [parse_ordering_key(queryset.model, key) for key in ordering]
+
+    # Return the page that follows (or, for previous cursors, precedes) the given cursor.
+    def page(self, cursor=None):
+        position, reverse = decode_cursor(cursor, len(self.keys)) if cursor else (None, False)
+        keys = [key.reversed() for key in self.keys] if reverse else self.keys
+
+        rows = self.fetch(keys, position)
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if not rows:
+            return CursorPage(rows, None, None)
+
+        has_next = has_more if not reverse else True
+        has_previous = (position is not None) if not reverse else has_more
+        next_cursor = encode_cursor(self.position_of(rows[-1]), False) if has_next else None
+        previous_cursor = encode_cursor(self.position_of(rows[0]), True) if has_previous else None
+        return CursorPage(rows, next_cursor, previous_cursor)
+
+    # Fetch up to page_size + 1 rows that follow the position in key order.
+    def fetch(self, keys, position):
+        return list(self.seek(self.queryset, keys, position)[:self.page_size + 1])
+
+    # Order a queryset by the keys and skip everything up to and including the position.
+    def seek(self, queryset, keys, position):
+        queryset = queryset.order_by(*[key.order_expression() for key in keys])
+        if position is not None:
+            try:
+                queryset = queryset.filter(seek_filter(keys, position))
+            except (ValidationError, ValueError, TypeError):
+                raise InvalidCursor("Invalid cursor.")
+        return queryset
+
+    # Return the ordering key values of an object.
+    def position_of(self, obj):
+        return [key.value_of(obj) for key in self.keys]
+
+
+"""
+Cursor paginator over several querysets sharing the ordering keys (e.g. live and archived rows).
+Each queryset is seeked on its own and the rows are merged in Python, so the keys must be non-nullable
+and the last key must be unique across all querysets.
+"""
+class MergedCursorPaginator(CursorPaginator):
+    def __init__(self, querysets, ordering, page_size):
+        super().__init__(querysets[0], ordering, page_size)
+        self.querysets = querysets
+
+    # Fetch up to page_size + 1 rows from every queryset and keep the first ones in key order.
+    def fetch(self, keys, position):
+        rows = [row for queryset in self.querysets for row in self.seek(queryset, keys, position)[:self.page_size + 1]]
+        return sort_by_keys(rows, keys)[:self.page_size + 1]
+
+
+"""A single ordering key of a cursor paginator."""
+class OrderingKey:
+    def __init__(self, field, descending, nullable, nulls_first=False):
+        self.field = field
+        self.descending = descending
+        self.nullable = nullable
+        self.nulls_first = nulls_first
+
+    # Return the same key in the opposite direction (NULL placement flips as well).
+    def reversed(self):
+        return OrderingKey(self.field, not self.descending, self.nullable, not self.nulls_first)
+
+    # Return the order_by() expression for this key.
+    def order_expression(self):
+        expression = F(self.field)
+        if not self.nullable:
+            return expression.desc() if self.descending else expression.asc()
+        nulls = {'nulls_first': True} if self.nulls_first else {'nulls_last': True}
+        return expression.desc(**nulls) if self.descending else expression.asc(**nulls)
+
+    # Rows whose key equals the value.
+    def equal_to(self, value):
+        if value is None:
+            return Q(**{f'{self.field}__isnull': True})
+        return Q(**{self.field: value})
+
+    # Rows whose key sorts strictly after the value.
+    def after(self, value):
+        if value is None:
+            return Q(**{f'{self.field}__isnull': False}) if self.nulls_first else Q(pk__in=[])
+        condition = Q(**{f'{self.field}__{"lt" if self.descending else "gt"}': value})
+        if self.nullable and not self.nulls_first:
+            condition |= Q(**{f'{self.field}__isnull': True})
+        return condition
+
+    # Read the key value from an object, following related lookups.
+    def value_of(self, obj):
+        value = obj
+        for attr in self.field.split(LOOKUP_SEP):
+            try:
+                value = getattr(value, attr)
+            except ObjectDoesNotExist:
+                return None
+            if value is None:
+                return None
+        return value
+
+
+# Build an ordering key from a field name with an optional '-' prefix.
+def parse_ordering_key(model, key):
+    descending = key.startswith('-')
+    field = key.lstrip('-')
+    return OrderingKey(field, descending, is_nullable(model, field))
+
+
+# Whether a (possibly related) lookup path can be NULL; annotations are treated as non-null.
+def is_nullable(model, path):
+    opts = model._meta
+    for name in path.split(LOOKUP_SEP):
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        if field.null or (field.is_relation and (field.auto_created and not field.concrete)):
+            return True
+        if field.is_relation:
+            opts = field.related_model._meta
+    return False
+
+
+# Row-value comparison "(k1, k2, ...) > (v1, v2, ...)" spelled out as OR-ed prefixes.
+def seek_filter(keys, position):
+    condition = Q(pk__in=[])
+    equal = Q()
+    for key, value in zip(keys, position):
+        condition |= equal & key.after(value)
+        equal &= key.equal_to(value)
+    return condition
+
+
+# Serialize a cursor value so that it round-trips through a query filter without losing precision.
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+# Encode a position into an opaque, URL-safe cursor token.
+def encode_cursor(position, reverse):
+    payload = json.dumps({'p': [_encode_value(value) for value in position], 'r': reverse}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+# Decode a cursor token into (position, reverse).
+def decode_cursor(token, length):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        position, reverse = payload['p'], bool(payload['r'])
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeDecodeError):
+        raise InvalidCursor("Invalid cursor.")
+
+    if not isinstance(position, list) or len(position) != length:
+        raise InvalidCursor("Invalid cursor.")
+    return position, reverse
+
+
+# Order a queryset by ordering keys using the same NULL placement as the cursor paginator.
+def order_by_keys(queryset, ordering):
+    return queryset.order_by(*[parse_ordering_key(queryset.model, key).order_expression() for key in ordering])
+
+
+# Sort objects in Python like order_by_keys() would (keys must be non-nullable).
+def sort_by_keys(objects, keys):
+    objects = list(objects)
+    for key in reversed(keys):
+        objects.sort(key=key.value_of, reverse=key.descending)
+    return objects
+
+
+# Headers of a plain list capped at one page: a Link (rel="next") to the cursor page that continues it.
+def next_page_link(request, page):
+    if not page.next_cursor:
+        return {}
+    url = replace_query_param(request.build_absolute_uri(), 'cursor', page.next_cursor)
+    return {'Link': f'<{url}>; rel="next"'}
@@ -29,6 +29,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'django_filters',
     'rest_framework.authtoken',
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     'orders_app',
     'reviews_app',
     'base_info_app',
+    'uploads_app',
 ]
 
 MIDDLEWARE = [
@@ -101,10 +103,53 @@ TIME_ZONE = 'UTC'
 USE_I18N = True
 USE_TZ = True
 
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "coderr"),
+    }
+}
+
+OFFERS_LIST_CACHE_TIMEOUT = int(os.getenv("OFFERS_LIST_CACHE_TIMEOUT", "300"))
+OFFERS_BULK_MAX_ITEMS = int(os.getenv("OFFERS_BULK_MAX_ITEMS", "500"))
+IMAGE_VARIANT_WORKERS = int(os.getenv("IMAGE_VARIANT_WORKERS", "2"))
+OFFER_SEARCH_CONFIG = os.getenv("OFFER_SEARCH_CONFIG", "english")
+OFFER_SUGGEST_CACHE_TIMEOUT = int(os.getenv("OFFER_SUGGEST_CACHE_TIMEOUT", "30"))
+ORDERS_MAX_PAGE_SIZE = int(os.getenv("ORDERS_MAX_PAGE_SIZE", "100"))
+ORDERS_BULK_MAX_ITEMS = int(os.getenv("ORDERS_BULK_MAX_ITEMS", "1000"))
+ORDERS_ARCHIVE_AFTER_DAYS = int(os.getenv("ORDERS_ARCHIVE_AFTER_DAYS", "365"))
+REVIEWS_MAX_PAGE_SIZE = int(os.getenv("REVIEWS_MAX_PAGE_SIZE", "100"))
+PROFILES_MAX_PAGE_SIZE = int(os.getenv("PROFILES_MAX_PAGE_SIZE", "100"))
+PLATFORM_STATS_CACHE_TIMEOUT = int(os.getenv("PLATFORM_STATS_CACHE_TIMEOUT", "60"))
+PLATFORM_STATS_MAX_AGE = int(os.getenv("PLATFORM_STATS_MAX_AGE", "300"))
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+UPLOAD_MAX_FILE_SIZE = int(os.getenv("UPLOAD_MAX_FILE_SIZE", str(5 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+UPLOAD_PARTIAL_DIR = os.getenv("UPLOAD_PARTIAL_DIR", str(BASE_DIR / 'uploads_partial'))
+
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv("AUTH_TOKEN_CACHE_TIMEOUT", "300"))
+AUTH_TOKEN_LOCAL_CACHE_TIMEOUT = int(os.getenv("AUTH_TOKEN_LOCAL_CACHE_TIMEOUT", "30"))
+AUTH_TOKEN_LOCAL_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_LOCAL_CACHE_SIZE", "1024"))
+AUTH_TOKEN_TTL_HOURS = int(os.getenv("AUTH_TOKEN_TTL_HOURS", "0"))
+AUTH_TOKEN_ROTATE_AFTER_HOURS = int(os.getenv("AUTH_TOKEN_ROTATE_AFTER_HOURS", "0"))
+
+MEDIA_SERVING = os.getenv("MEDIA_SERVING", "django")
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+MEDIA_CACHE_MAX_AGE = int(os.getenv("MEDIA_CACHE_MAX_AGE", str(30 * 24 * 60 * 60)))
+MEDIA_ACCESS_POLICY = os.getenv("MEDIA_ACCESS_POLICY", "core.media.public_media")
+
+FILE_UPLOAD_HANDLERS = [
+    'core.uploads.MaxSizeUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
 REST_FRAMEWORK = {
     'DATETIME_FORMAT': "%Y-%m-%dT%H:%M:%SZ",
     'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticated',],
-    'DEFAULT_AUTHENTICATION_CLASSES': ['rest_framework.authentication.TokenAuthentication',],
+    'DEFAULT_AUTHENTICATION_CLASSES': ['auth_app.authentication.CachedTokenAuthentication',],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 6,
     'DEFAULT_FILTER_BACKENDS': [
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.files import File
+from django.core.files.uploadhandler import FileUploadHandler
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# Human readable upload limit, e.g. "5 MB".
+def max_upload_size_label():
+    return f'{settings.UPLOAD_MAX_FILE_SIZE / (1024 * 1024):g} MB'
+
+
+"""Upload larger than UPLOAD_MAX_FILE_SIZE; answered with 413 before the rest of the body is stored."""
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_code = 'upload_too_large'
+
+    def __init__(self, detail=None, code=None):
+        super().__init__(detail or f'The file must not be larger than {max_upload_size_label()}.', code)
+
+
+"""
+First entry of FILE_UPLOAD_HANDLERS: rejects multipart bodies by their Content-Length and files by
+their first chunk over the limit, before the following handlers buffer them in memory or on disk.
+The body may exceed the file limit by DATA_UPLOAD_MAX_MEMORY_SIZE for the other form fields.
+"""
+class MaxSizeUploadHandler(FileUploadHandler):
+
+    # Reject the request when its body cannot hold a file within the limit plus the form fields.
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        allowance = settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0
+        if content_length > settings.UPLOAD_MAX_FILE_SIZE + allowance:
+            raise UploadTooLarge()
+
+    # Stop at the first chunk that crosses the limit; otherwise pass the chunk on unchanged.
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.UPLOAD_MAX_FILE_SIZE:
+            raise UploadTooLarge()
+        return raw_data
+
+    # The file itself is built by the next handler.
+    def file_complete(self, file_size):
+        return None
+
+
+"""A fully received local file; storages that support it (FileSystemStorage) move it instead of copying."""
+class LocalUploadedFile(File):
+    def __init__(self, path, name):
+        super().__init__(open(path, 'rb'), name)
+        self.path = path
+
+    # Path of the file on disk, used by FileSystemStorage to move the file into place.
+    def temporary_file_path(self):
+        return self.path
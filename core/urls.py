@@ -1,5 +1,7 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.conf import settings
+from django.urls import path, include, re_path
+from core.media import serve_media
 
 """ API URL patterns for all application modules. """
 api_urlpatterns = [
@@ -9,6 +11,7 @@ api_urlpatterns = [
     path('', include('orders_app.api.urls')),
     path('', include('reviews_app.api.urls')),
     path('', include('base_info_app.api.urls')),
+    path('', include('uploads_app.api.urls')),
 ]
 
 """ Main URL patterns for admin, authentication, and API endpoints. """
@@ -17,3 +20,7 @@ urlpatterns = [
     path('api-auth/', include('rest_framework.urls')),
     path('api/', include(api_urlpatterns)),
 ]
+
+# Media is routed through Django in development, or in production when a proxy hand-off mode is set.
+if settings.DEBUG or settings.MEDIA_SERVING != 'django':
+    urlpatterns += [re_path(rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.+)$', serve_media)]
@@ -1,6 +1,26 @@
-from django.db.models import Q
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import F, Q
+from core.pagination import order_by_keys
+from offers_app.models import Offer
 
-# Apply filtering to offers queryset based on query parameters.
+"""Supported values for the ordering query parameter, each with an id tiebreaker (NULL prices sort last)."""
+OFFER_ORDERINGS = {
+    'updated_at': ('updated_at', 'id'),
+    '-updated_at': ('-updated_at', '-id'),
+    'min_price': ('min_price', 'id'),
+    '-min_price': ('-min_price', '-id'),
+    'min_delivery_time': ('min_delivery_time', 'id'),
+    'relevance': ('-rank', '-updated_at', '-id'),
+}
+
+"""Orderings usable with cursor pagination (relevance ranks are floats and not stable cursor keys)."""
+OFFER_CURSOR_ORDERINGS = [ordering for ordering in OFFER_ORDERINGS if ordering != 'relevance']
+
+DEFAULT_OFFER_ORDERING = '-updated_at'
+
+# Apply filtering to offers queryset based on query parameters and the offer summary columns.
 def apply_offer_filters(queryset, params):
     creator_id = params.get('creator_id')
     if creator_id:
@@ -10,7 +30,7 @@ def apply_offer_filters(queryset, params):
     if min_price is not None:
         try:
             min_price = float(min_price)
-            queryset = queryset.filter(details__price__gte=min_price)
+            queryset = queryset.filter(max_price__gte=min_price)
         except ValueError:
             raise ValueError("Invalid value for min_price. Must be a number.")
 
@@ -18,28 +38,45 @@ def apply_offer_filters(queryset, params):
     if max_delivery_time is not None and max_delivery_time != "":
         try:
             max_delivery_time = int(max_delivery_time)  
-            queryset = queryset.filter(details__delivery_time_in_days__lte=max_delivery_time)
+            queryset = queryset.filter(min_delivery_time__lte=max_delivery_time)
         except ValueError:
             raise ValueError("Invalid value for max_delivery_time. Must be an integer.")
 
     search = params.get('search')
     if search:
-        queryset = queryset.filter(
+        queryset = apply_offer_search(queryset, search)
+
+    return queryset
+
+# Full-text search ranked by relevance on PostgreSQL, substring match on other databases.
+def apply_offer_search(queryset, search):
+    if connections[queryset.db].vendor != 'postgresql':
+        return queryset.filter(
             Q(title__icontains=search) | Q(description__icontains=search)
         )
 
-    return queryset
+    query = SearchQuery(search, search_type='websearch', config=settings.OFFER_SEARCH_CONFIG)
+    return queryset.filter(search_vector=query).annotate(rank=SearchRank(F('search_vector'), query))
 
-# Order offers queryset by updated_at or min_price.
+# Resolve the ordering keys; unknown values (or relevance without a ranked search) fall back to newest first.
+def get_offer_ordering(queryset, ordering_param):
+    if ordering_param == 'relevance' and 'rank' not in queryset.query.annotations:
+        ordering_param = DEFAULT_OFFER_ORDERING
+    return OFFER_ORDERINGS.get(ordering_param or DEFAULT_OFFER_ORDERING, OFFER_ORDERINGS[DEFAULT_OFFER_ORDERING])
+
+# Order offers queryset in the database.
 def apply_offer_ordering(queryset, ordering_param):
-    if ordering_param:
-        if ordering_param == 'updated_at':
-            return queryset.order_by('updated_at')
-        elif ordering_param == 'min_price':
+    return order_by_keys(queryset, get_offer_ordering(queryset, ordering_param))
+
 
-            return sorted(
-                queryset,
-                key=lambda o: min([d.price for d in o.details.all()]) if o.details.exists() else float('inf')
-            )
+# Return the best fuzzy title matches as {id, title} pairs, served by the trigram index on PostgreSQL.
+def suggest_offer_titles(query, limit):
+    offers = Offer.objects.all()
+    if connections[offers.db].vendor == 'postgresql':
+        offers = offers.filter(
+            Q(title__icontains=query) | Q(title__trigram_word_similar=query)
+        ).annotate(similarity=TrigramWordSimilarity(query, 'title')).order_by('-similarity', 'id')
+    else:
+        offers = offers.filter(title__icontains=query).order_by('title', 'id')
 
-    return queryset.order_by('-updated_at')
\ No newline at end of file
+    return list(offers.values('id', 'title')[:limit])
@@ -1,7 +1,11 @@
 from auth_app.models import Account
 from rest_framework import serializers
-from offers_app.models import Offer, OfferDetail
+from offers_app.models import Offer, OfferDetail, OfferType
 from rest_framework.reverse import reverse
+from django.db import transaction
+from offers_app.cache import bump_offers_version
+from core.images import schedule_variants, variant_urls
+from core.fieldsets import DynamicFieldsMixin
 
 """Serializer for offer detail objects."""
 class OfferDetailsSerializer(serializers.ModelSerializer):
@@ -21,6 +25,32 @@ class OfferDetailsSerializer(serializers.ModelSerializer):
                 data['price'] = int(float(price))
         return data
 
+"""List serializer that imports many offers with a constant number of queries."""
+class OfferBulkListSerializer(serializers.ListSerializer):
+
+    # Create all offers, their details and the join rows in one transaction.
+    def create(self, validated_data):
+        user = self.context['request'].user
+
+        if user.user_type != Account.BUSINESS:
+            raise serializers.ValidationError("Only business users can create offers.")
+
+        pairs = [self.child.build_offer(item, user) for item in validated_data]
+        with transaction.atomic():
+            offers = Offer.objects.bulk_create([offer for offer, _ in pairs])
+            create_offer_details(pairs)
+            # bulk_create() sends no post_save, so the search vectors are built here.
+            Offer.objects.filter(pk__in=[offer.pk for offer in offers]).refresh_search_vectors()
+            transaction.on_commit(bump_offers_version)
+        return offers
+
+# Insert the details of saved offers with one bulk INSERT.
+def create_offer_details(offers_with_details):
+    for offer, details in offers_with_details:
+        for detail in details:
+            detail.offer = offer
+    OfferDetail.objects.bulk_create([detail for _, details in offers_with_details for detail in details])
+
 """Serializer for creating and validating offers."""
 class OfferSerializer(serializers.ModelSerializer):
     details = OfferDetailsSerializer(many=True) 
@@ -30,11 +60,15 @@ class OfferSerializer(serializers.ModelSerializer):
         model = Offer
         fields = ['id', 'title', 'image', 'description', 'details']
         read_only_fields = ['id']
+        list_serializer_class = OfferBulkListSerializer
 
-    # Validate that at least 3 offer details are provided.
+    # Validate that at least 3 offer details with distinct offer types are provided.
     def validate(self, data):
         if 'details' in data and len(data['details']) < 3:
             raise serializers.ValidationError({'details': 'At least 3 offer details are required.'})
+        offer_types = [detail.get('offer_type', OfferType.STANDARD) for detail in data.get('details', [])]
+        if len(set(offer_types)) != len(offer_types):
+            raise serializers.ValidationError({'details': 'Duplicate offer_type values are not allowed.'})
         return data
 
     # Return image URL if present.
@@ -43,30 +77,37 @@ class OfferSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
 
-    # Create an offer with related details.
-    def create(self, validated_data):
+    # Build an unsaved offer and its unsaved details, with the summary columns already set.
+    def build_offer(self, validated_data, user):
+        validated_data = dict(validated_data)
         details_data = validated_data.pop('details')
+        detail_objs = [OfferDetail(**{k: v for k, v in detail_data.items() if k != 'id'}) for detail_data in details_data]
+        offer = Offer(user=user, **validated_data)
+        offer.set_summary(detail_objs)
+        return offer, detail_objs
+
+    # Create an offer with related details in one transaction.
+    def create(self, validated_data):
         user = self.context['request'].user
 
         if user.user_type != Account.BUSINESS:
             raise serializers.ValidationError("Only business users can create offers.")
     
-        validated_data['user'] = user
-        offer = Offer.objects.create(**validated_data)
-        
-        for detail_data in details_data:
-            detail_obj = OfferDetail.objects.create(**detail_data)
-            offer.details.add(detail_obj)
-            
+        offer, detail_objs = self.build_offer(validated_data, user)
+        with transaction.atomic():
+            offer.save()
+            create_offer_details([(offer, detail_objs)])
+            schedule_variants(offer.image, on_done=bump_offers_version)
         return offer
 
 """Serializer for minimal offer detail representation."""
-class OfferDetailMiniSerializer(serializers.ModelSerializer):
+class OfferDetailMiniSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
 
     class Meta:
         model = OfferDetail
         fields = ['id', 'url']
+        field_dependencies = {'url': ['id']}
 
     # Return URL for offer detail.
     def get_url(self, obj):
@@ -81,46 +122,53 @@ class UserDetailsSerializer(serializers.ModelSerializer):
         fields = ['first_name', 'last_name', 'username']
 
 
-"""Serializer for listing offers with summary info."""
-class OfferListSerializer(serializers.ModelSerializer):
+"""Serializer for listing offers with summary info; supports sparse fieldsets."""
+class OfferListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     details = OfferDetailMiniSerializer(many=True)
     min_price = serializers.SerializerMethodField()
     min_delivery_time = serializers.SerializerMethodField()
     user_details = UserDetailsSerializer(source='user')
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
+        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'image_variants', 'user_details']
+        field_dependencies = {'min_price': ['min_price'], 'min_delivery_time': ['min_delivery_time'], 'image_variants': ['image', 'image_variant_set']}
 
-    # Get minimum price from offer details.
+    # Get minimum price from the offer's summary column.
     def get_min_price(self, obj):
-        prices = obj.details.values_list('price', flat=True)
-        return int(min(prices)) if prices else None
+        return int(obj.min_price) if obj.min_price is not None else None
 
-    # Get minimum delivery time from offer details.
+    # Get minimum delivery time from the offer's summary column.
     def get_min_delivery_time(self, obj):
-        times = obj.details.values_list('delivery_time_in_days', flat=True)
-        return min(times) if times else None
+        return obj.min_delivery_time
+
+    # Get URLs of the resized image variants.
+    def get_image_variants(self, obj):
+        return variant_urls(obj.image, self.context.get('request'))
 
 """Serializer for a single offer with summary info."""
 class OfferListSingleSerializer(serializers.ModelSerializer):
     details = OfferDetailMiniSerializer(many=True)
     min_price = serializers.SerializerMethodField()
     min_delivery_time = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time']
+        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'image_variants']
 
-    # Get minimum price from offer details.
+    # Get minimum price from the offer's summary column.
     def get_min_price(self, obj):
-        prices = obj.details.values_list('price', flat=True)
-        return int(min(prices)) if prices else None
+        return int(obj.min_price) if obj.min_price is not None else None
 
-    # Get minimum delivery time from offer details.
+    # Get minimum delivery time from the offer's summary column.
     def get_min_delivery_time(self, obj):
-        times = obj.details.values_list('delivery_time_in_days', flat=True)
-        return min(times) if times else None
+        return obj.min_delivery_time
+
+    # Get URLs of the resized image variants.
+    def get_image_variants(self, obj):
+        return variant_urls(obj.image, self.context.get('request'))
     
 
 """Serializer for updating an offer and its details."""
@@ -143,7 +191,7 @@ class OfferSinglePatchSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Each detail must include its 'offer_type'.")
         return value
 
-    # Update offer and its related details.
+    # Update offer and its related details in one transaction; tier changes are written with one bulk UPDATE.
     def update(self, instance, validated_data):
         details_data = validated_data.pop('details', None)
         user = self.context['request'].user
@@ -154,27 +202,39 @@ class OfferSinglePatchSerializer(serializers.ModelSerializer):
         # Update main offer fields
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
 
-        # Handle detail updates based on offer_type
-        if details_data is not None:
-            details_by_type = {detail.offer_type: detail for detail in instance.details.all()}
+        with transaction.atomic():
+            # Handle detail updates based on offer_type
+            if details_data is not None:
+                details_by_type = {detail.offer_type: detail for detail in instance.details.all()}
+                changed_details = []
+                changed_fields = set()
+
+                for detail_data in details_data:
+                    offer_type = detail_data.get('offer_type')
+
+                    if offer_type not in details_by_type:
+                        raise serializers.ValidationError(
+                            f"OfferDetail with offer_type '{offer_type}' does not belong to this offer."
+                        )
+
+                    detail_obj = details_by_type[offer_type]
 
-            for detail_data in details_data:
-                offer_type = detail_data.get('offer_type')
+                    for attr, value in detail_data.items():
+                        if attr not in ('offer_type', 'id'):
+                            setattr(detail_obj, attr, value)
+                            changed_fields.add(attr)
+                    changed_details.append(detail_obj)
 
-                if offer_type not in details_by_type:
-                    raise serializers.ValidationError(
-                        f"OfferDetail with offer_type '{offer_type}' does not belong to this offer."
-                    )
+                if changed_details and changed_fields:
+                    OfferDetail.objects.bulk_update(changed_details, sorted(changed_fields))
 
-                detail_obj = details_by_type[offer_type]
+                instance.set_summary(details_by_type.values())
 
-                for attr, value in detail_data.items():
-                    if attr != 'offer_type':  
-                        setattr(detail_obj, attr, value)
-                detail_obj.save()
+            instance.save()
 
+            if 'image' in validated_data:
+                schedule_variants(instance.image, on_done=bump_offers_version)
         return instance
 
 """The serializer's response includes the update offer and its details."""
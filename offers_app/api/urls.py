@@ -1,9 +1,11 @@
 from django.urls import path
-from .views import OffersView, OfferSingleView, OfferDetailView
+from .views import OffersView, OfferBulkCreateView, OfferSuggestView, OfferSingleView, OfferDetailView
 
 """ URL patterns for offers, offer details, and image upload endpoints. """
 urlpatterns = [
     path('offers/', OffersView.as_view()),
+    path('offers/bulk/', OfferBulkCreateView.as_view(), name='offer-bulk'),
+    path('offers/suggest/', OfferSuggestView.as_view(), name='offer-suggest'),
     path('offers/<int:id>/', OfferSingleView.as_view(), name='offer-specific'),
     path('offerdetails/<int:id>/', OfferDetailView.as_view(), name='offer-detail')
 ]
\ No newline at end of file
@@ -6,8 +6,18 @@ from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from .serializers import OfferSerializer, OfferDetailsSerializer, OfferListSerializer, OfferListSingleSerializer, OfferSinglePatchSerializer, OfferSinglePatchResponseSerializer
 from offers_app.models import Offer, OfferDetail
 from django.core.paginator import Paginator
-from .filters import apply_offer_filters, apply_offer_ordering
+from django.conf import settings
+from django.core.cache import cache
+from hashlib import md5
+from rest_framework.utils.urls import replace_query_param
+from django.db import transaction
+from django.utils import timezone
+from core.conditional import conditional_get, if_match_satisfied, timestamp_etag
+from core.pagination import CursorPaginator, InvalidCursor
+from core.fieldsets import ordering_paths, sparse_fieldset
+from .filters import OFFER_CURSOR_ORDERINGS, apply_offer_filters, apply_offer_ordering, get_offer_ordering, suggest_offer_titles
 from .permissions import IsBusinessUser
+from offers_app.cache import offers_list_cache_key, set_cached_offers_list
 
 """List or create offers."""
 class OffersView(APIView):
@@ -21,10 +31,22 @@ class OffersView(APIView):
             return [IsAuthenticated(), IsBusinessUser()]
         return super().get_permissions()    
 
-    # List offers with filtering, ordering, and pagination.
+    # List offers, served from the versioned response cache when possible.
     def get(self, request):
+        cache_key = offers_list_cache_key(request)
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+
+        response = self.list_offers(request)
+        if response.status_code == status.HTTP_200_OK:
+            set_cached_offers_list(cache_key, response.data)
+        return response
+
+    # List offers with filtering, ordering, and pagination; ?fields= / ?omit= trim the payload and the loaded columns.
+    def list_offers(self, request):
         try:
-            offers = Offer.objects.prefetch_related('details').select_related('user')
+            offers = Offer.objects.all()
 
             try:
                 offers = apply_offer_filters(offers, request.query_params)
@@ -32,6 +54,13 @@ class OffersView(APIView):
                 return Response({'error': f'Error while filtering the offers: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
 
             ordering = request.query_params.get('ordering')
+            fieldset = sparse_fieldset(request)
+            # Cursors are built from the ordering keys, so those are loaded even when not requested.
+            offers = OfferListSerializer(**fieldset).prune_queryset(offers, required=ordering_paths(get_offer_ordering(offers, ordering)))
+
+            if self.is_cursor_mode(request):
+                return self.get_cursor_page(request, offers, ordering, fieldset)
+
             try:
                 offers = apply_offer_ordering(offers, ordering)
             except Exception as e:
@@ -51,11 +80,11 @@ class OffersView(APIView):
             except EmptyPage:
                 return Response({'error': 'The requested page is empty or out of the valid range.'}, status=status.HTTP_404_NOT_FOUND)
 
-            serializer = OfferListSerializer(paged_offers, many=True)
+            serializer = OfferListSerializer(paged_offers, many=True, **fieldset)
 
-            base_url = request.build_absolute_uri('?').split('?')[0]
-            next_url = f'{base_url}?page={page + 1}' if paged_offers.has_next() else None
-            prev_url = f'{base_url}?page={page - 1}' if paged_offers.has_previous() else None
+            url = request.build_absolute_uri()
+            next_url = replace_query_param(url, 'page', page + 1) if paged_offers.has_next() else None
+            prev_url = replace_query_param(url, 'page', page - 1) if paged_offers.has_previous() else None
 
             return Response({
                 'count': paginator.count,
@@ -67,6 +96,37 @@ class OffersView(APIView):
         except Exception as e:
             return Response({'error': f'Unexpected error: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    # Cursor mode is used when a cursor is passed or requested with pagination=cursor.
+    def is_cursor_mode(self, request):
+        return 'cursor' in request.query_params or request.query_params.get('pagination') == 'cursor'
+
+    # List one keyset page without COUNT(*); next/previous links keep all active filters.
+    def get_cursor_page(self, request, offers, ordering, fieldset):
+        if ordering not in OFFER_CURSOR_ORDERINGS and ordering:
+            return Response({'error': f'Ordering must be one of {", ".join(OFFER_CURSOR_ORDERINGS)} in cursor mode.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page_size = int(request.query_params.get('page_size', 6))
+        except ValueError:
+            return Response({'error': 'Invalid value for page_size. Must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        if page_size < 1:
+            return Response({'error': 'page_size must be a positive integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = CursorPaginator(offers, get_offer_ordering(offers, ordering), page_size)
+        try:
+            page = paginator.page(request.query_params.get('cursor'))
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = OfferListSerializer(page.object_list, many=True, **fieldset)
+
+        url = request.build_absolute_uri()
+        return Response({
+            'next': replace_query_param(url, 'cursor', page.next_cursor) if page.next_cursor else None,
+            'previous': replace_query_param(url, 'cursor', page.previous_cursor) if page.previous_cursor else None,
+            'results': serializer.data
+        }, status=status.HTTP_200_OK)
+
     # Create a new offer (business users only).
     def post(self, request):
         serializer = OfferSerializer(data=request.data, context={'request': request})
@@ -80,11 +140,63 @@ class OffersView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+"""Import many offers in one request."""
+class OfferBulkCreateView(APIView):
+    permission_classes = [IsAuthenticated, IsBusinessUser]
+
+    # Validate every item, then create all offers atomically; per-item errors are returned by index.
+    def post(self, request):
+        serializer = OfferSerializer(
+            data=request.data, many=True, allow_empty=False,
+            max_length=settings.OFFERS_BULK_MAX_ITEMS, context={'request': request}
+        )
+        if serializer.is_valid():
+            try:
+                offers = serializer.save()
+            except Exception as e:
+                return Response({'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            created = Offer.objects.filter(pk__in=[offer.pk for offer in offers]).prefetch_related('details').order_by('pk')
+            return Response(OfferSerializer(created, many=True).data, status=status.HTTP_201_CREATED)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+"""Typeahead suggestions for offer titles."""
+class OfferSuggestView(APIView):
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    min_query_length = 2
+    default_limit = 8
+    max_limit = 20
+
+    # Return the top fuzzy title matches as {id, title}, cached per normalized prefix.
+    def get(self, request):
+        query = ' '.join(request.query_params.get('q', '').split()).lower()
+        if len(query) < self.min_query_length:
+            return Response([], status=status.HTTP_200_OK)
+
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return Response({'error': 'Invalid value for limit. Must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, self.max_limit))
+
+        cache_key = f'offers:suggest:{limit}:{md5(query.encode()).hexdigest()}'
+        suggestions = cache.get(cache_key)
+        if suggestions is None:
+            suggestions = suggest_offer_titles(query, limit)
+            cache.set(cache_key, suggestions, settings.OFFER_SUGGEST_CACHE_TIMEOUT)
+
+        return Response(suggestions, status=status.HTTP_200_OK)
+
+
 """Retrieve, update, or delete a single offer."""
 class OfferSingleView(APIView):
     permission_classes = [IsAuthenticated]
 
-    # Retrieve a single offer by ID.
+    # Retrieve a single offer by ID; unchanged offers are answered with 304.
+    @conditional_get(lambda id: Offer.objects.filter(pk=id).values_list('updated_at', flat=True).first())
     def get(self, request, id):
         try:
             offer = Offer.objects.prefetch_related('details').select_related('user').get(pk=id)
@@ -106,16 +218,32 @@ class OfferSingleView(APIView):
         if request.user.id != offer.user_id:
             return Response({"detail": "Only the owner can update this Offer."}, status=status.HTTP_403_FORBIDDEN)
 
+        if_match = request.headers.get('If-Match')
+        if if_match and not if_match_satisfied(if_match, timestamp_etag(offer.updated_at)):
+            return self.precondition_failed(offer)
+
         serializer = OfferSinglePatchSerializer(offer, data=request.data, partial=True, context={'request': request})
 
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                # Compare-and-swap on updated_at: a concurrent edit since the offer was loaded makes this match no row.
+                if if_match and not Offer.objects.filter(pk=offer.pk, updated_at=offer.updated_at).update(updated_at=timezone.now()):
+                    return self.precondition_failed(Offer.objects.only('updated_at').get(pk=offer.pk))
+                serializer.save()
 
             response_serializer = OfferSinglePatchResponseSerializer(offer, context={'request': request})
-            return Response(response_serializer.data, status=status.HTTP_200_OK)
+            return Response(response_serializer.data, status=status.HTTP_200_OK, headers={'ETag': timestamp_etag(offer.updated_at)})
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    # Reject an edit based on a stale ETag and return the current one.
+    def precondition_failed(self, offer):
+        return Response(
+            {"detail": "The offer has been modified since it was retrieved."},
+            status=status.HTTP_412_PRECONDITION_FAILED,
+            headers={'ETag': timestamp_etag(offer.updated_at)}
+        )
+
     # Delete a single offer by ID (owner only).
     def delete(self, request, id):
         try:
@@ -134,7 +262,8 @@ class OfferSingleView(APIView):
 class OfferDetailView(APIView):
     permission_classes = [IsAuthenticated]
     
-    # Get offer detail by ID.
+    # Get offer detail by ID; details change only through their offer, so its updated_at is the validator.
+    @conditional_get(lambda id: OfferDetail.objects.filter(pk=id).values_list('offer__updated_at', flat=True).first())
     def get(self, request, id):
         try:
             offer_detail = OfferDetail.objects.get(pk=id)
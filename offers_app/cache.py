@@ -0,0 +1,37 @@
+import time
+from hashlib import md5
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+
+OFFERS_VERSION_KEY = 'offers:version'
+
+# Return the current offers version, seeding it with a timestamp so an evicted counter never reuses old keys.
+def get_offers_version():
+    version = cache.get(OFFERS_VERSION_KEY)
+    if version is None:
+        cache.add(OFFERS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(OFFERS_VERSION_KEY)
+    return version
+
+# Invalidate every cached offers response in O(1) by moving to a new version.
+def bump_offers_version():
+    try:
+        cache.incr(OFFERS_VERSION_KEY)
+    except ValueError:
+        cache.set(OFFERS_VERSION_KEY, time.time_ns(), None)
+
+# Build the cache key of an offers list response from the version, host and normalized query parameters.
+def offers_list_cache_key(request):
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+        if value != ''
+    )
+    fingerprint = md5(f'{request.get_host()}?{urlencode(params)}'.encode()).hexdigest()
+    return f'offers:list:{get_offers_version()}:{fingerprint}'
+
+# Store an offers list payload under the given key.
+def set_cached_offers_list(cache_key, data):
+    cache.set(cache_key, data, settings.OFFERS_LIST_CACHE_TIMEOUT)
@@ -0,0 +1,50 @@
+from concurrent.futures import as_completed
+from django.core.management.base import BaseCommand
+from core.images import IMAGE_VARIANTS, get_executor, record_variants, recorded_variants, render_variants, variant_name, variant_targets
+from offers_app.cache import bump_offers_version
+from offers_app.models import Offer
+from profile_app.models import Profile
+
+"""Backfill resized image variants for offer images and profile files."""
+class Command(BaseCommand):
+    help = "Generate missing thumbnail, card and full-size WebP variants for existing media."
+
+    # Register command line options.
+    def add_arguments(self, parser):
+        parser.add_argument('--only', choices=['offers', 'profiles'], help="Limit the backfill to one kind of media.")
+        parser.add_argument('--force', action='store_true', help="Regenerate variants that already exist.")
+
+    # Queue every file that needs variants on the worker pool and wait for the results.
+    def handle(self, *args, **options):
+        files = []
+        if options['only'] in (None, 'offers'):
+            files += [offer.image for offer in Offer.objects.exclude(image='').exclude(image=None).only('id', 'image', 'image_variant_set').iterator()]
+        if options['only'] in (None, 'profiles'):
+            files += [profile.file for profile in Profile.objects.exclude(file='').exclude(file=None).only('user_id', 'file', 'file_variant_set').iterator()]
+
+        futures = {}
+        for field_file in files:
+            if not options['force'] and self.has_variants(field_file):
+                # Variants made before they were recorded on the row are recorded now.
+                if recorded_variants(field_file) != list(IMAGE_VARIANTS):
+                    record_variants(field_file, IMAGE_VARIANTS)
+                continue
+            resolved = variant_targets(field_file)
+            if resolved is None:
+                continue
+            futures[get_executor().submit(render_variants, *resolved)] = field_file
+
+        failed = 0
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                failed += 1
+                self.stderr.write(f"{futures[future].name}: {future.exception()}")
+            else:
+                record_variants(futures[future], IMAGE_VARIANTS)
+
+        bump_offers_version()
+        self.stdout.write(self.style.SUCCESS(f"Generated variants for {len(futures) - failed} files ({failed} failed)."))
+
+    # Whether all variants of a file already exist.
+    def has_variants(self, field_file):
+        return all(field_file.storage.exists(variant_name(field_file.name, variant)) for variant in IMAGE_VARIANTS)
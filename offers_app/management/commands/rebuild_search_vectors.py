@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import connections
+from offers_app.models import Offer
+
+"""Backfill or rebuild the full-text search vectors of offers."""
+class Command(BaseCommand):
+    help = "Recompute Offer.search_vector from title, description and the business username (PostgreSQL only)."
+
+    # Register command line options.
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true', help="Only build vectors of offers that have none.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Number of offers updated per statement.")
+
+    # Refresh the vectors in primary key batches to keep each UPDATE short.
+    def handle(self, *args, **options):
+        if connections[Offer.objects.db].vendor != 'postgresql':
+            self.stdout.write("Full-text search needs PostgreSQL; no search vectors rebuilt.")
+            return
+
+        offers = Offer.objects.filter(search_vector__isnull=True) if options['missing_only'] else Offer.objects.all()
+        updated = 0
+        last_id = 0
+        while True:
+            ids = list(offers.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            updated += Offer.objects.filter(pk__in=ids).refresh_search_vectors()
+            last_id = ids[-1]
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search vectors of {updated} offers."))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from offers_app.cache import bump_offers_version
+from offers_app.models import Offer
+
+"""Backfill or verify the denormalized price and delivery summary columns on offers."""
+class Command(BaseCommand):
+    help = "Recompute Offer.min_price, max_price and min_delivery_time from the offer details."
+
+    # Register command line options.
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help="Only report offers whose summary columns are out of date.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Number of offers updated per statement.")
+
+    # Run the backfill or the verification.
+    def handle(self, *args, **options):
+        if options['verify']:
+            self.verify()
+        else:
+            self.backfill(options['batch_size'])
+
+    # Refresh the summary columns in primary key batches to keep each UPDATE short.
+    def backfill(self, batch_size):
+        updated = 0
+        last_id = 0
+        while True:
+            ids = list(Offer.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            updated += Offer.objects.filter(pk__in=ids).refresh_summaries()
+            last_id = ids[-1]
+        bump_offers_version()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed summary columns of {updated} offers."))
+
+    # Compare the stored summary columns with values aggregated from the details.
+    def verify(self):
+        offers = Offer.objects.annotate(
+            expected_min_price=Min('details__price'),
+            expected_max_price=Max('details__price'),
+            expected_min_delivery_time=Min('details__delivery_time_in_days'),
+        ).values_list(
+            'pk', 'min_price', 'max_price', 'min_delivery_time',
+            'expected_min_price', 'expected_max_price', 'expected_min_delivery_time',
+        ).order_by('pk')
+
+        stale = [row[0] for row in offers.iterator(chunk_size=2000) if row[1:4] != row[4:7]]
+        if stale:
+            raise CommandError(f"{len(stale)} offers have stale summary columns, e.g. ids {stale[:20]}. Run without --verify to repair.")
+        self.stdout.write(self.style.SUCCESS("All offer summary columns are up to date."))
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:06
+
+from django.db import migrations, models
+
+
+def backfill_offer_summaries(apps, schema_editor):
+    Offer = apps.get_model("offers_app", "Offer")
+    OfferDetail = apps.get_model("offers_app", "OfferDetail")
+    details = (
+        OfferDetail.objects.filter(offer=models.OuterRef("pk"))
+        .order_by()
+        .values("offer")
+    )
+    Offer.objects.update(
+        min_price=models.Subquery(
+            details.annotate(value=models.Min("price")).values("value")
+        ),
+        max_price=models.Subquery(
+            details.annotate(value=models.Max("price")).values("value")
+        ),
+        min_delivery_time=models.Subquery(
+            details.annotate(value=models.Min("delivery_time_in_days")).values("value")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers_app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="offer",
+            name="max_price",
+            field=models.DecimalField(
+                blank=True,
+                db_index=True,
+                decimal_places=2,
+                editable=False,
+                max_digits=15,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="offer",
+            name="min_delivery_time",
+            field=models.PositiveIntegerField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="offer",
+            name="min_price",
+            field=models.DecimalField(
+                blank=True,
+                db_index=True,
+                decimal_places=2,
+                editable=False,
+                max_digits=15,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill_offer_summaries, migrations.RunPython.noop),
+    ]
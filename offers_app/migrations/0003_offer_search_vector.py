@@ -0,0 +1,48 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+
+def backfill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Offer = apps.get_model("offers_app", "Offer")
+    Account = apps.get_model("auth_app", "Account")
+    username = Account.objects.filter(pk=models.OuterRef("user_id")).values("username")
+    config = settings.OFFER_SEARCH_CONFIG
+    Offer.objects.update(
+        search_vector=(
+            SearchVector("title", weight="A", config=config)
+            + SearchVector("description", weight="B", config=config)
+            + SearchVector(models.Subquery(username), weight="C", config=config)
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers_app", "0002_offer_summary_columns"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="offer",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="offer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="offer_search_vector_gin"
+            ),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:13
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers_app", "0003_offer_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="offer",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["title"],
+                name="offer_title_trgm_gin",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
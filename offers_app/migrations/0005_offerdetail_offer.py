@@ -0,0 +1,23 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers_app", "0004_offer_title_trigram_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="offerdetail",
+            name="offer",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="offers_app.offer",
+            ),
+        ),
+    ]
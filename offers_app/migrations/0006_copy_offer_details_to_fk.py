@@ -0,0 +1,56 @@
+from django.db import migrations, models
+
+
+def copy_m2m_to_fk(apps, schema_editor):
+    Offer = apps.get_model("offers_app", "Offer")
+    OfferDetail = apps.get_model("offers_app", "OfferDetail")
+    Through = Offer._meta.get_field("details").remote_field.through
+
+    OfferDetail.objects.update(
+        offer_id=models.Subquery(
+            Through.objects.filter(offerdetail_id=models.OuterRef("pk"))
+            .order_by("offer_id")
+            .values("offer_id")[:1]
+        )
+    )
+    # Details that belong to no offer were unreachable through the API.
+    OfferDetail.objects.filter(offer__isnull=True).delete()
+
+    duplicates = list(
+        OfferDetail.objects.values("offer_id", "offer_type")
+        .annotate(count=models.Count("id"))
+        .filter(count__gt=1)
+        .values_list("offer_id", "offer_type")[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Offers with more than one detail of the same offer_type must be cleaned up "
+            f"before migrating (offer_id, offer_type): {duplicates}"
+        )
+
+
+def copy_fk_to_m2m(apps, schema_editor):
+    Offer = apps.get_model("offers_app", "Offer")
+    OfferDetail = apps.get_model("offers_app", "OfferDetail")
+    Through = Offer._meta.get_field("details").remote_field.through
+
+    Through.objects.bulk_create(
+        [
+            Through(offer_id=offer_id, offerdetail_id=detail_id)
+            for detail_id, offer_id in OfferDetail.objects.values_list(
+                "id", "offer_id"
+            ).iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers_app", "0005_offerdetail_offer"),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_m2m_to_fk, copy_fk_to_m2m),
+    ]
@@ -0,0 +1,32 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers_app", "0006_copy_offer_details_to_fk"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="offer",
+            name="details",
+        ),
+        migrations.AlterField(
+            model_name="offerdetail",
+            name="offer",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="details",
+                to="offers_app.offer",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="offerdetail",
+            constraint=models.UniqueConstraint(
+                fields=("offer", "offer_type"), name="unique_offer_detail_type"
+            ),
+        ),
+    ]
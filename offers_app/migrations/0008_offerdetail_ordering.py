@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:53
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers_app", "0007_remove_offer_details_m2m"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="offerdetail",
+            options={"ordering": ["id"]},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("offers_app", "0008_offerdetail_ordering"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="offer",
+            name="image_variant_set",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
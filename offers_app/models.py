@@ -1,4 +1,7 @@
-from django.db import models
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import connections, models
 from auth_app.models import Account
 
 """Choices for offer types."""
@@ -15,20 +18,75 @@ class OfferDetail(models.Model):
     price = models.DecimalField(max_digits=15, decimal_places=2, blank=False, null=True)
     features = models.JSONField(default=list, blank=True)
     offer_type = models.CharField(max_length=10, choices=OfferType.choices, default=OfferType.STANDARD)
+    # Indexed through the (offer, offer_type) unique constraint, which also serves lookups by offer alone.
+    offer = models.ForeignKey('Offer', on_delete=models.CASCADE, related_name='details', db_index=False)
+
+    class Meta:
+        # Details are returned in creation order (basic, standard, premium), not in unique index order.
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['offer', 'offer_type'], name='unique_offer_detail_type'),
+        ]
 
     # Return the offer detail title.
     def __str__(self):
         return self.title
        
+"""QuerySet with bulk maintenance helpers for offers."""
+class OfferQuerySet(models.QuerySet):
+
+    # Recompute the price and delivery summary columns from each offer's details in one UPDATE.
+    def refresh_summaries(self):
+        details = OfferDetail.objects.filter(offer=models.OuterRef('pk')).order_by().values('offer')
+        return self.update(
+            min_price=models.Subquery(details.annotate(value=models.Min('price')).values('value')),
+            max_price=models.Subquery(details.annotate(value=models.Max('price')).values('value')),
+            min_delivery_time=models.Subquery(details.annotate(value=models.Min('delivery_time_in_days')).values('value')),
+        )
+
+    # Rebuild the weighted full-text search vector (title, description, business username); PostgreSQL only.
+    def refresh_search_vectors(self):
+        if connections[self.db].vendor != 'postgresql':
+            return 0
+        username = Account.objects.filter(pk=models.OuterRef('user_id')).values('username')
+        config = settings.OFFER_SEARCH_CONFIG
+        return self.update(
+            search_vector=(
+                SearchVector('title', weight='A', config=config)
+                + SearchVector('description', weight='B', config=config)
+                + SearchVector(models.Subquery(username), weight='C', config=config)
+            )
+        )
+
 """Model for an offer created by a business user."""
 class Offer(models.Model):
     user = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='offers', blank=False, editable=False)
     title = models.CharField(max_length=255)
     image = models.ImageField(upload_to='offer_images/', blank=True, null=True)
+    image_variant_set = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    details = models.ManyToManyField(OfferDetail, blank=True)
+    min_price = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True, editable=False, db_index=True)
+    max_price = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True, editable=False, db_index=True)
+    min_delivery_time = models.PositiveIntegerField(null=True, blank=True, editable=False, db_index=True)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+
+    objects = OfferQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='offer_search_vector_gin'),
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='offer_title_trgm_gin'),
+        ]
+
+    # Set the summary columns from the given offer details (saved or not).
+    def set_summary(self, details):
+        prices = [detail.price for detail in details if detail.price is not None]
+        times = [detail.delivery_time_in_days for detail in details]
+        self.min_price = min(prices) if prices else None
+        self.max_price = max(prices) if prices else None
+        self.min_delivery_time = min(times) if times else None
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,43 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from auth_app.models import Account
+from offers_app.cache import bump_offers_version
+from offers_app.models import Offer, OfferDetail
+
+"""Account fields shown in the offers list (user_details)."""
+OFFER_LIST_ACCOUNT_FIELDS = {'username', 'first_name', 'last_name'}
+
+"""Offer fields that feed the full-text search vector (with the business username)."""
+OFFER_SEARCH_FIELDS = {'title', 'description'}
+
+# Any offer or offer detail write invalidates the cached offers list once the transaction commits.
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offers_list(sender, **kwargs):
+    transaction.on_commit(bump_offers_version)
+
+# Name changes of business users show up in user_details, so they invalidate the cached offers list too.
+@receiver(post_save, sender=Account)
+def invalidate_offers_list_on_account_change(sender, instance, update_fields=None, **kwargs):
+    if instance.user_type != Account.BUSINESS:
+        return
+    if update_fields is None or OFFER_LIST_ACCOUNT_FIELDS.intersection(update_fields):
+        transaction.on_commit(bump_offers_version)
+
+# However an offer is saved, its search vector follows the searchable fields (PostgreSQL only).
+@receiver(post_save, sender=Offer)
+def refresh_offer_search_vector(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not OFFER_SEARCH_FIELDS.intersection(update_fields)):
+        return
+    Offer.objects.filter(pk=instance.pk).refresh_search_vectors()
+
+# The business username is weighted into the search vector, so a rename refreshes the user's offers.
+@receiver(post_save, sender=Account)
+def refresh_search_vectors_on_rename(sender, instance, created=False, update_fields=None, **kwargs):
+    if created or instance.user_type != Account.BUSINESS:
+        return
+    if update_fields is None or 'username' in update_fields:
+        Offer.objects.filter(user=instance).refresh_search_vectors()
@@ -0,0 +1,107 @@
+import io
+from decimal import Decimal
+from unittest import skipUnless
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from auth_app.models import Account
+from core.images import IMAGE_VARIANTS, record_variants
+from offers_app.api.filters import apply_offer_search
+from offers_app.models import Offer
+
+"""Recording image variants changes the offer's validator, so clients revalidating a copy without them get a 200."""
+class OfferVariantRevalidationTests(TestCase):
+
+    def setUp(self):
+        business = Account.objects.create_user(username='business', password='secret-pw-123', user_type=Account.BUSINESS)
+        self.offer = Offer.objects.create(user=business, title='Logo', image='offer_images/logo.png')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=business).key}')
+
+    def test_revalidation_after_variants_are_recorded(self):
+        url = f'/api/offers/{self.offer.pk}/'
+        response = self.client.get(url)
+        self.assertEqual(response.data['image_variants'], {})
+
+        record_variants(Offer.objects.get(pk=self.offer.pk).image, IMAGE_VARIANTS)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['image_variants']), set(IMAGE_VARIANTS))
+
+
+"""Search vectors follow offers saved through the model layer and business user renames."""
+@skipUnless(connection.vendor == 'postgresql', "Full-text search vectors are PostgreSQL only.")
+class OfferSearchVectorTests(TestCase):
+
+    def setUp(self):
+        self.business = Account.objects.create_user(username='designstudio', password='secret-pw-123', user_type=Account.BUSINESS)
+
+    # Ids of the offers a search matches.
+    def search(self, text):
+        return set(apply_offer_search(Offer.objects.all(), text).values_list('pk', flat=True))
+
+    def test_model_save_builds_the_vector(self):
+        offer = Offer.objects.create(user=self.business, title='Website redesign', description='Responsive layouts')
+        self.assertEqual(self.search('redesign'), {offer.pk})
+
+        offer.title = 'Logo sketches'
+        offer.save()
+        self.assertEqual(self.search('redesign'), set())
+        self.assertEqual(self.search('logo'), {offer.pk})
+
+    def test_rename_refreshes_the_business_offers(self):
+        offer = Offer.objects.create(user=self.business, title='Logo')
+        self.business.username = 'pixelforge'
+        self.business.save()
+        self.assertEqual(self.search('pixelforge'), {offer.pk})
+
+    def test_command_backfills_missing_vectors(self):
+        offer = Offer.objects.create(user=self.business, title='Illustration')
+        Offer.objects.filter(pk=offer.pk).update(search_vector=None)
+        self.assertEqual(self.search('illustration'), set())
+
+        call_command('rebuild_search_vectors', '--missing-only', stdout=io.StringIO())
+        self.assertEqual(self.search('illustration'), {offer.pk})
+
+
+"""Cursor pages of the offers list cover every offer once, in order, in both directions."""
+class OfferCursorPaginationTests(TestCase):
+
+    # Offers with tied prices, so only the id tiebreaker separates them, and one without a price.
+    def setUp(self):
+        cache.clear()
+        business = Account.objects.create_user(username='business', password='secret-pw-123', user_type=Account.BUSINESS)
+        prices = [Decimal('20'), Decimal('10'), Decimal('20'), None, Decimal('10'), Decimal('20'), Decimal('30')]
+        self.offers = [Offer.objects.create(user=business, title=f'Offer {index}', min_price=price) for index, price in enumerate(prices)]
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=business).key}')
+
+    # Follow the next (or previous) links from a URL and return the ids of every page.
+    def walk(self, url, direction='next'):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            pages.append([offer['id'] for offer in response.data['results']])
+            last_url, url = url, response.data[direction]
+        return pages, last_url
+
+    def test_pages_follow_price_then_id_with_nulls_last(self):
+        pages, last_url = self.walk('/api/offers/?pagination=cursor&ordering=min_price&page_size=2')
+        expected = [offer.pk for offer in sorted(self.offers, key=lambda offer: (offer.min_price is None, offer.min_price or 0, offer.pk))]
+        self.assertEqual([offer_id for page in pages for offer_id in page], expected)
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+
+        backwards, _ = self.walk(last_url, direction='previous')
+        self.assertEqual(backwards, pages[::-1])
+
+    def test_descending_order_and_invalid_cursor(self):
+        pages, _ = self.walk('/api/offers/?pagination=cursor&ordering=-updated_at&page_size=3')
+        self.assertEqual([offer_id for page in pages for offer_id in page], [offer.pk for offer in reversed(self.offers)])
+
+        response = self.client.get('/api/offers/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,61 @@
+import datetime
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from auth_app.models import Account
+from orders_app.models import Order, StatusType
+
+"""Keyset ordering of order listings, newest first, backed by the (role, status, created_at) indexes."""
+ORDER_LIST_ORDERING = ('-created_at', '-id')
+
+# Return the orders of a user (live, or archived with ArchivedOrder) through queries that can use the
+# per-role composite indexes.
+def orders_for_user(user, model=Order):
+    if user.user_type == Account.BUSINESS:
+        return model.objects.filter(business_user=user)
+    if user.user_type == Account.CUSTOMER:
+        return model.objects.filter(customer_user=user)
+
+    # Users without a role (e.g. staff) may appear on either side: UNION two index scans instead of an OR.
+    ids = model.objects.filter(business_user=user).values('pk').union(
+        model.objects.filter(customer_user=user).values('pk')
+    )
+    return model.objects.filter(pk__in=ids)
+
+# Whether the query parameters ask to include archived orders.
+def include_archived(params):
+    return params.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+# Apply the status and created_at range filters of the query parameters.
+def apply_order_filters(queryset, params):
+    status_param = params.get('status')
+    if status_param:
+        statuses = [value.strip() for value in status_param.split(',') if value.strip()]
+        invalid = [value for value in statuses if value not in StatusType.values]
+        if invalid:
+            raise ValueError(f"Invalid value for status. Must be one of {', '.join(StatusType.values)}.")
+        queryset = queryset.filter(status__in=statuses)
+
+    created_after = params.get('created_after')
+    if created_after:
+        queryset = queryset.filter(created_at__gte=parse_moment(created_after, 'created_after'))
+
+    created_before = params.get('created_before')
+    if created_before:
+        queryset = queryset.filter(created_at__lt=parse_moment(created_before, 'created_before'))
+
+    return queryset
+
+# Parse an ISO 8601 date or datetime; dates mean midnight and naive values use the current time zone.
+def parse_moment(value, name):
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            date = parse_date(value)
+            moment = datetime.datetime.combine(date, datetime.time.min) if date else None
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ValueError(f"Invalid value for {name}. Must be an ISO 8601 date or datetime.")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
@@ -0,0 +1,33 @@
+import hashlib
+import json
+from rest_framework import status
+from rest_framework.response import Response
+from orders_app.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+# Fingerprint of a request so a reused key can be told apart from a genuine retry.
+def request_fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(f'{request.method} {request.path}\n{body}'.encode()).hexdigest()
+
+# Return the stored key of this user, or None.
+def get_stored_key(user, key):
+    return IdempotencyKey.objects.filter(user=user, key=key).first()
+
+# Replay a stored response, or reject a key that was used for a different request.
+def replay_response(stored, fingerprint):
+    if stored.request_hash != fingerprint:
+        return Response(
+            {'detail': 'This Idempotency-Key was already used for a different request.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return Response(stored.response_body, status=stored.response_status, headers={'Idempotent-Replayed': 'true'})
+
+# Store the response of a request; must run in the transaction that did the work.
+def store_response(user, key, fingerprint, response_status, response_body):
+    return IdempotencyKey.objects.create(
+        user=user, key=key, request_hash=fingerprint,
+        response_status=response_status, response_body=response_body
+    )
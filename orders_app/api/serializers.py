@@ -1,12 +1,15 @@
 from rest_framework import serializers
-from offers_app.models import Offer, OfferDetail
-from orders_app.models import Order
-from offers_app.models import Offer
+from offers_app.models import OfferDetail
+from orders_app.models import ORDER_STATUS_TRANSITIONS, Order, OrderStats, StatusType, transition_sources
 from auth_app.models import Account
 from rest_framework.exceptions import PermissionDenied
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from core.fieldsets import DynamicFieldsMixin
 
-"""Serializer for order objects."""
-class OrderSerializer(serializers.ModelSerializer):
+"""Serializer for order objects; supports sparse fieldsets."""
+class OrderSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = ['id', 'customer_user','business_user', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type', 'status', 'created_at', 'updated_at']
@@ -26,35 +29,30 @@ class OrderSerializer(serializers.ModelSerializer):
 class CreateOrderFromOfferSerializer(serializers.Serializer):
     offer_detail_id = serializers.IntegerField()
 
-    # Ensure the provided OfferDetail ID exists in the database.
-    def validate_offer_detail_id(self, value):
-        if not OfferDetail.objects.filter(id=value).exists():
-            raise serializers.ValidationError("OfferDetail with this ID does not exist.")
-        return value
-
-    # Validate the user's permission: only customers can create orders.
+    # Validate the user's permission (only customers can create orders), then load the offer detail
+    # together with its offer's business user id in a single query.
     def validate(self, data):
         user = self.context.get('request').user
         if user.user_type != Account.CUSTOMER:
             raise PermissionDenied("Only customer users can create orders.")
+
+        offer_detail = OfferDetail.objects.select_related('offer').only(
+            'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type', 'offer__user'
+        ).filter(id=data['offer_detail_id']).first()
+        if offer_detail is None:
+            raise serializers.ValidationError({'offer_detail_id': "OfferDetail with this ID does not exist."})
+
+        data['offer_detail'] = offer_detail
         return data
 
     # Create an Order instance based on the given OfferDetail.
     def create(self, validated_data):
-        offer_detail_id = validated_data["offer_detail_id"]
+        offer_detail = validated_data['offer_detail']
         user = self.context['request'].user
 
-        offer = Offer.objects.filter(details__id=offer_detail_id).first()
-        if not offer:
-            raise serializers.ValidationError("No offer found for this OfferDetail.")
-
-        offer_detail = offer.details.filter(id=offer_detail_id).first()
-        if not offer_detail:
-            raise serializers.ValidationError("OfferDetail not found in this offer.")
-        
         order = Order.objects.create(
             customer_user=user,  
-            business_user=offer.user,    
+            business_user_id=offer_detail.offer.user_id,    
             title=offer_detail.title,
             revisions=offer_detail.revisions,
             delivery_time_in_days=offer_detail.delivery_time_in_days,
@@ -71,11 +69,19 @@ class OrderSinglePatchSerializer(serializers.ModelSerializer):
         fields = ['status']
         read_only_fields = ['id', 'customer_user','business_user', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type', 'created_at', 'updated_at']
 
-    # Validate that only business users can update orders.
+    # Validate that only the order's business user can update it, and only along allowed transitions.
     def validate(self, data):
         user = self.context.get('request').user
         if user.user_type != Account.BUSINESS:
             raise PermissionDenied("Only business users can update orders.")
+        if self.instance is not None and self.instance.business_user_id != user.id:
+            raise PermissionDenied("Only the order's business user can update it.")
+
+        # Enforce the status state machine (keeping the current status is allowed).
+        target = data.get('status')
+        current = self.instance.status if self.instance is not None else None
+        if target and current and target != current and target not in ORDER_STATUS_TRANSITIONS.get(current, ()):
+            raise serializers.ValidationError({'status': f"An order cannot move from '{current}' to '{target}'."})
         return data
        
     # Update order instance with new data.
@@ -86,6 +92,59 @@ class OrderSinglePatchSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
+"""Serializer for moving many orders of the requesting business user to a new status."""
+class OrderBulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=settings.ORDERS_BULK_MAX_ITEMS)
+    status = serializers.ChoiceField(choices=StatusType.choices)
+
+    # Validate that only business users can update orders.
+    def validate(self, data):
+        user = self.context.get('request').user
+        if user.user_type != Account.BUSINESS:
+            raise PermissionDenied("Only business users can update orders.")
+        data['ids'] = list(dict.fromkeys(data['ids']))
+        return data
+
+    # Lock and classify the orders, move the allowed ones with one conditional UPDATE and return per-id results.
+    def create(self, validated_data):
+        user = self.context['request'].user
+        ids, target = validated_data['ids'], validated_data['status']
+        sources = transition_sources(target)
+
+        with transaction.atomic():
+            current = {
+                pk: (business_user_id, order_status)
+                for pk, business_user_id, order_status in Order.objects.select_for_update()
+                .filter(pk__in=ids).values_list('pk', 'business_user_id', 'status')
+            }
+            results = [self.classify(pk, current.get(pk), user.id, target, sources) for pk in ids]
+            moving = [result for result in results if result['result'] == 'updated']
+
+            if moving:
+                # Bulk UPDATEs bypass the order signals, so the counters are adjusted here.
+                Order.objects.filter(
+                    pk__in=[result['id'] for result in moving], business_user=user, status__in=sources
+                ).update(status=target, updated_at=timezone.now())
+                OrderStats.objects.adjust(
+                    [(user.id, result['previous_status'], -1) for result in moving] + [(user.id, target, len(moving))]
+                )
+        return results
+
+    # Outcome for one requested id: updated, unchanged, invalid_transition, forbidden or not_found.
+    def classify(self, pk, row, user_id, target, sources):
+        if row is None:
+            return {'id': pk, 'result': 'not_found'}
+        business_user_id, order_status = row
+        if business_user_id != user_id:
+            return {'id': pk, 'result': 'forbidden'}
+        if order_status == target:
+            result = 'unchanged'
+        elif order_status in sources:
+            result = 'updated'
+        else:
+            result = 'invalid_transition'
+        return {'id': pk, 'result': result, 'previous_status': order_status}
+
 """Serializer for returning order count."""
 class OrderCountSerializer(serializers.Serializer):
     order_count = serializers.IntegerField()
@@ -93,4 +152,12 @@ class OrderCountSerializer(serializers.Serializer):
 
 """Serializer for returning completed order count."""
 class CompletedOrderSerializer(serializers.Serializer):
-    completed_order_count = serializers.IntegerField()
\ No newline at end of file
+    completed_order_count = serializers.IntegerField()
+
+
+"""Serializer for returning all order counters of a business user."""
+class OrderStatsSerializer(serializers.Serializer):
+    business_user = serializers.IntegerField()
+    in_progress_count = serializers.IntegerField()
+    completed_count = serializers.IntegerField()
+    cancelled_count = serializers.IntegerField()
\ No newline at end of file
@@ -1,10 +1,13 @@
 from django.urls import path
-from .views import OrdersView, OrderSingleView, OrderCountView, CompletedOrderCountView
+from .views import OrdersView, OrderSingleView, OrderCountView, CompletedOrderCountView, OrderStatsView, OrderBulkStatusView, OrderExportView
 
 """ URL patterns for order management endpoints. """
 urlpatterns = [
     path('orders/', OrdersView.as_view()),
+    path('orders/export/', OrderExportView.as_view(), name='order-export'),
+    path('orders/bulk-status/', OrderBulkStatusView.as_view(), name='order-bulk-status'),
     path('orders/<int:pk>/', OrderSingleView.as_view(), name='order-detail'),
     path('order-count/<int:business_user_id>/', OrderCountView.as_view(), name='order-count'),
-    path('completed-order-count/<int:business_user_id>/', CompletedOrderCountView.as_view(), name='completed-order-count')
+    path('completed-order-count/<int:business_user_id>/', CompletedOrderCountView.as_view(), name='completed-order-count'),
+    path('order-stats/<int:business_user_id>/', OrderStatsView.as_view(), name='order-stats')
 ]
\ No newline at end of file
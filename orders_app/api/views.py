@@ -1,34 +1,153 @@
 from auth_app.models import Account
-from django.db.models import Q
-from orders_app.models import Order
+from orders_app.models import ORDER_STATS_FIELDS, ArchivedOrder, Order
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-from .serializers import OrderSerializer, CreateOrderFromOfferSerializer, OrderSinglePatchSerializer, OrderCountSerializer, CompletedOrderSerializer
+from contextlib import nullcontext
+from django.db import IntegrityError, transaction
+from .serializers import OrderSerializer, CreateOrderFromOfferSerializer, OrderSinglePatchSerializer, OrderCountSerializer, CompletedOrderSerializer, OrderStatsSerializer, OrderBulkStatusSerializer
+from django.conf import settings
+from rest_framework.utils.urls import replace_query_param
+from core.pagination import CursorPaginator, InvalidCursor, MergedCursorPaginator, next_page_link
+import heapq
+from core.export import EXPORT_FORMATS, ExportMixin, get_export_format, iterate_rows, stream_export
+from core.fieldsets import ordering_paths, sparse_fieldset
+from .filters import ORDER_LIST_ORDERING, apply_order_filters, include_archived, orders_for_user
+from .idempotency import IDEMPOTENCY_HEADER, MAX_KEY_LENGTH, get_stored_key, replay_response, request_fingerprint, store_response
 
 """List or create orders for the authenticated user."""
 class OrdersView(APIView):
     permission_classes = [IsAuthenticated]
     
-    # List all orders for the current user.
+    # List the orders of the current user, filtered by status and created_at range; archived orders only on request.
+    # ?fields= / ?omit= trim the payload and the loaded columns.
     def get(self, request):
-        user = request.user.id
-        orders = Order.objects.filter(Q(customer_user=user) | Q(business_user=user)).distinct()
-        
-        serializer = OrderSerializer(orders, many=True, context={'request': request})
-        return Response(serializer.data)
+        models = [Order, ArchivedOrder] if include_archived(request.query_params) else [Order]
+        try:
+            querysets = [apply_order_filters(orders_for_user(request.user, model), request.query_params) for model in models]
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        fieldset = sparse_fieldset(request)
+        pruner = OrderSerializer(**fieldset)
+        querysets = [pruner.prune_queryset(queryset, required=ordering_paths(ORDER_LIST_ORDERING)) for queryset in querysets]
+
+        if self.is_cursor_mode(request):
+            return self.get_cursor_page(request, querysets, fieldset)
+
+        # Without a cursor the plain list is capped at ORDERS_MAX_PAGE_SIZE; the Link header continues it.
+        if len(querysets) == 1:
+            paginator = CursorPaginator(querysets[0], ORDER_LIST_ORDERING, settings.ORDERS_MAX_PAGE_SIZE)
+        else:
+            paginator = MergedCursorPaginator(querysets, ORDER_LIST_ORDERING, settings.ORDERS_MAX_PAGE_SIZE)
+        page = paginator.page()
+        serializer = OrderSerializer(page.object_list, many=True, context={'request': request}, **fieldset)
+        return Response(serializer.data, headers=next_page_link(request, page))
+
+    # Cursor mode is used when a cursor is passed or requested with pagination=cursor.
+    def is_cursor_mode(self, request):
+        return 'cursor' in request.query_params or request.query_params.get('pagination') == 'cursor'
+
+    # List one keyset page of orders, newest first, without COUNT(*).
+    def get_cursor_page(self, request, querysets, fieldset):
+        try:
+            page_size = int(request.query_params.get('page_size', 20))
+        except ValueError:
+            return Response({'error': 'Invalid value for page_size. Must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        if page_size < 1:
+            return Response({'error': 'page_size must be a positive integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        page_size = min(page_size, settings.ORDERS_MAX_PAGE_SIZE)
+
+        if len(querysets) == 1:
+            paginator = CursorPaginator(querysets[0], ORDER_LIST_ORDERING, page_size)
+        else:
+            paginator = MergedCursorPaginator(querysets, ORDER_LIST_ORDERING, page_size)
+        try:
+            page = paginator.page(request.query_params.get('cursor'))
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = OrderSerializer(page.object_list, many=True, context={'request': request}, **fieldset)
+
+        url = request.build_absolute_uri()
+        return Response({
+            'next': replace_query_param(url, 'cursor', page.next_cursor) if page.next_cursor else None,
+            'previous': replace_query_param(url, 'cursor', page.previous_cursor) if page.previous_cursor else None,
+            'results': serializer.data
+        }, status=status.HTTP_200_OK)
     
-    # Create a new order from an offer.
+    # Create a new order from an offer; with an Idempotency-Key header a retry replays the stored response.
     def post(self, request):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is not None:
+            if not key or len(key) > MAX_KEY_LENGTH:
+                return Response({'detail': f'Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters long.'}, status=status.HTTP_400_BAD_REQUEST)
+            fingerprint = request_fingerprint(request)
+            stored = get_stored_key(request.user, key)
+            if stored is not None:
+                return replay_response(stored, fingerprint)
+
         serializer = CreateOrderFromOfferSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
             try:
-                order = serializer.save()
-                return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
+                with transaction.atomic() if key is not None else nullcontext():
+                    order = serializer.save()
+                    data = OrderSerializer(order).data
+                    if key is not None:
+                        store_response(request.user, key, fingerprint, status.HTTP_201_CREATED, data)
+            except IntegrityError:
+                # A concurrent request with the same key committed first; its order stands and this one is rolled back.
+                stored = get_stored_key(request.user, key) if key is not None else None
+                if stored is None:
+                    raise
+                return replay_response(stored, fingerprint)
             except Exception as e:
                 return Response({'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return Response(data, status=status.HTTP_201_CREATED)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+"""Columns of the order export, in order."""
+ORDER_EXPORT_COLUMNS = ['id', 'customer_user', 'business_user', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type', 'status', 'created_at', 'updated_at']
+
+"""Stream the current user's orders as CSV or NDJSON."""
+class OrderExportView(ExportMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    # Export the orders (filters as in the order list) oldest first with constant memory.
+    def get(self, request):
+        export_format = get_export_format(request)
+        if export_format is None:
+            return Response({'error': f'Invalid value for format. Must be one of {", ".join(EXPORT_FORMATS)}.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        models = [Order, ArchivedOrder] if include_archived(request.query_params) else [Order]
+        try:
+            querysets = [apply_order_filters(orders_for_user(request.user, model), request.query_params) for model in models]
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Each table is streamed in (created_at, id) order; heapq.merge keeps the combined stream ordered.
+        streams = [iterate_rows(queryset.order_by('created_at', 'id').values_list(*ORDER_EXPORT_COLUMNS)) for queryset in querysets]
+        created_at, order_id = ORDER_EXPORT_COLUMNS.index('created_at'), ORDER_EXPORT_COLUMNS.index('id')
+        rows = heapq.merge(*streams, key=lambda row: (row[created_at], row[order_id]))
+        return stream_export(rows, ORDER_EXPORT_COLUMNS, export_format, 'orders')
+
+"""Move many orders of the requesting business user to a new status."""
+class OrderBulkStatusView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    # Apply one status transition to all given order ids and report the outcome per id.
+    def patch(self, request):
+        serializer = OrderBulkStatusSerializer(data=request.data, context={'request': request})
+        if serializer.is_valid():
+            results = serializer.save()
+            return Response({
+                'status': serializer.validated_data['status'],
+                'updated': sum(1 for result in results if result['result'] == 'updated'),
+                'results': results
+            }, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -36,48 +155,58 @@ class OrdersView(APIView):
 class OrderSingleView(APIView):
     permission_classes = [IsAuthenticated]
 
-    # Update a single order by ID.
+    # Update the status of a single order by ID (the order's business user only).
+    # The row stays locked from validation to save, so concurrent updates are checked against the committed status.
     def patch(self, request, pk):
-        try:
-            order = Order.objects.get(pk=pk)
-        except Order.DoesNotExist:
-            return Response({"detail": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
+        with transaction.atomic():
+            try:
+                order = Order.objects.select_for_update().get(pk=pk)
+            except Order.DoesNotExist:
+                return Response({"detail": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
+
+            serializer = OrderSinglePatchSerializer(order, data=request.data, partial=True, context={'request': request})
+            if serializer.is_valid():
+                order = serializer.save()
+                return Response(OrderSerializer(order, context={'request': request}).data)
 
-        serializer = OrderSinglePatchSerializer(order, data=request.data, partial=True, context={'request': request})
-        if serializer.is_valid():
-            order = serializer.save()
-            return Response(OrderSerializer(order, context={'request': request}).data)
-        
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     # Delete a single order by ID (admin only).
+    # The lock makes a concurrent or retried delete wait and then find no order, so the counters move once.
     def delete(self, request, pk):
         if not request.user.is_staff:
             return Response({"detail": "Only admin users can delete orders."}, status=status.HTTP_403_FORBIDDEN)
         
-        try:
-            order = Order.objects.get(pk=pk)
-        except Order.DoesNotExist:
-            return Response({"detail": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
+        with transaction.atomic():
+            try:
+                order = Order.objects.select_for_update().get(pk=pk)
+            except Order.DoesNotExist:
+                return Response({"detail": "Order not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        order.delete()
+            order.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+# Load a business user's order counters with the account in one query; 404 for unknown or non-business users.
+def get_business_order_stats(business_user_id):
+    account = get_object_or_404(
+        Account.objects.values('user_type', *[f'order_stats__{field}' for field in ORDER_STATS_FIELDS.values()]),
+        id=business_user_id
+    )
+    if account['user_type'] != Account.BUSINESS:
+        return None
+    return {field: account[f'order_stats__{field}'] or 0 for field in ORDER_STATS_FIELDS.values()}
+
 """Get count of in-progress orders for a business user."""
 class OrderCountView(APIView):
     permission_classes = [IsAuthenticated]
        
     # Return count of in-progress orders for a business user.
     def get(self, request, business_user_id):
-        business_user = get_object_or_404(Account, id=business_user_id)
-        
-        if business_user.user_type != Account.BUSINESS:
+        stats = get_business_order_stats(business_user_id)
+        if stats is None:
             return Response({"detail": "This user is not a business user."}, status=status.HTTP_404_NOT_FOUND)
 
-        orders = Order.objects.filter(Q(business_user_id=business_user_id) & Q(status="in_progress")).distinct()
-        count_in_progress = orders.count()
-        serializer = OrderCountSerializer({'order_count': count_in_progress}, context={'request': request})
-
+        serializer = OrderCountSerializer({'order_count': stats['in_progress_count']}, context={'request': request})
         return Response(serializer.data)
     
 """Get count of completed orders for a business user."""
@@ -86,13 +215,22 @@ class CompletedOrderCountView(APIView):
        
     # Return count of completed orders for a business user.
     def get(self, request, business_user_id):
-        business_user = get_object_or_404(Account, id=business_user_id)
-
-        if business_user.user_type != Account.BUSINESS:
+        stats = get_business_order_stats(business_user_id)
+        if stats is None:
             return Response({"detail": "This user is not a business user."}, status=status.HTTP_404_NOT_FOUND)
 
-        orders = Order.objects.filter(Q(business_user_id=business_user_id) & Q(status="completed")).distinct()
-        count_completed = orders.count()
-        serializer = CompletedOrderSerializer({'completed_order_count': count_completed}, context={'request': request})
+        serializer = CompletedOrderSerializer({'completed_order_count': stats['completed_count']}, context={'request': request})
+        return Response(serializer.data)
+
+"""Get all order counters of a business user."""
+class OrderStatsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    # Return the in-progress, completed and cancelled order counts of a business user.
+    def get(self, request, business_user_id):
+        stats = get_business_order_stats(business_user_id)
+        if stats is None:
+            return Response({"detail": "This user is not a business user."}, status=status.HTTP_404_NOT_FOUND)
 
+        serializer = OrderStatsSerializer({'business_user': business_user_id, **stats}, context={'request': request})
         return Response(serializer.data)
\ No newline at end of file
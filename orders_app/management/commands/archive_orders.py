@@ -0,0 +1,51 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from orders_app.models import CLOSED_ORDER_STATUSES, ArchivedOrder, Order
+from orders_app.signals import order_counting_suspended
+
+"""Fields copied from a live order into its archive row."""
+ARCHIVED_FIELDS = [field.attname for field in ArchivedOrder._meta.concrete_fields if field.name != 'archived_at']
+
+"""Move completed and cancelled orders that have been closed for a while into the archive table."""
+class Command(BaseCommand):
+    help = "Move closed orders last updated more than --older-than-days ago from the orders table into ArchivedOrder."
+
+    # Register command line options.
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=settings.ORDERS_ARCHIVE_AFTER_DAYS, help="Minimum age in days since the order was last updated.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Number of orders moved per transaction.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many orders would be archived.")
+
+    # Archive in batches so each transaction and lock stays short.
+    def handle(self, *args, **options):
+        if options['older_than_days'] < 0 or options['batch_size'] < 1:
+            raise CommandError("--older-than-days must not be negative and --batch-size must be positive.")
+
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+        candidates = Order.objects.filter(status__in=CLOSED_ORDER_STATUSES, updated_at__lt=cutoff)
+        if options['dry_run']:
+            self.stdout.write(f"{candidates.count()} orders would be archived.")
+            return
+
+        archived = 0
+        while True:
+            moved = self.archive_batch(candidates, options['batch_size'])
+            if not moved:
+                break
+            archived += moved
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} orders."))
+
+    # Copy one locked batch into the archive and delete it from the orders table.
+    def archive_batch(self, candidates, batch_size):
+        with transaction.atomic():
+            rows = list(candidates.select_for_update(skip_locked=True).order_by('pk').values(*ARCHIVED_FIELDS)[:batch_size])
+            if not rows:
+                return 0
+            ArchivedOrder.objects.bulk_create([ArchivedOrder(**row) for row in rows])
+            # Archived orders stay counted in OrderStats.
+            with order_counting_suspended():
+                Order.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        return len(rows)
@@ -0,0 +1,19 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from orders_app.models import IdempotencyKey
+
+"""Delete stored Idempotency-Key responses that are older than the retry window."""
+class Command(BaseCommand):
+    help = "Delete idempotency keys older than IDEMPOTENCY_KEY_TTL_HOURS (or --older-than-hours)."
+
+    # Register command line options.
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-hours', type=int, default=settings.IDEMPOTENCY_KEY_TTL_HOURS, help="Age in hours after which keys are deleted.")
+
+    # Delete the expired keys.
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['older_than_hours'])
+        deleted, _ = IdempotencyKey.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} idempotency keys."))
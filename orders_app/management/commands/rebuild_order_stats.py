@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from orders_app.models import ORDER_STATS_FIELDS, OrderStats, count_orders_by_business
+
+"""Rebuild or verify the per-business order counters."""
+class Command(BaseCommand):
+    help = "Recompute OrderStats (in progress, completed and cancelled order counts) from the orders table."
+
+    # Register command line options.
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help="Only report businesses whose counters are out of date.")
+
+    # Run the rebuild or the verification.
+    def handle(self, *args, **options):
+        if options['verify']:
+            self.verify()
+        else:
+            count = OrderStats.objects.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt order counters of {count} business users."))
+
+    # Compare the stored counters with fresh counts.
+    def verify(self):
+        fields = list(ORDER_STATS_FIELDS.values())
+        expected = {
+            row['business_user']: tuple(row.get(field, 0) for field in fields)
+            for row in count_orders_by_business()
+        }
+        stored = {row[0]: tuple(row[1:]) for row in OrderStats.objects.values_list('business_user', *fields)}
+
+        stale = [
+            business_user_id for business_user_id in expected.keys() | stored.keys()
+            if expected.get(business_user_id, (0,) * len(fields)) != stored.get(business_user_id, (0,) * len(fields))
+        ]
+        for business_user_id in sorted(stale):
+            self.stdout.write(f"Business user {business_user_id}: stored {stored.get(business_user_id)}, expected {expected.get(business_user_id)}")
+        if stale:
+            self.stdout.write(self.style.WARNING(f"{len(stale)} business users have stale order counters."))
+        else:
+            self.stdout.write(self.style.SUCCESS("All order counters are up to date."))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders_app", "0002_idempotency_key"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["business_user", "status", "created_at"],
+                name="order_business_status_created",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["customer_user", "status", "created_at"],
+                name="order_customer_status_created",
+            ),
+        ),
+    ]
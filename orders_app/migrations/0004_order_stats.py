@@ -0,0 +1,60 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_order_stats(apps, schema_editor):
+    Order = apps.get_model("orders_app", "Order")
+    OrderStats = apps.get_model("orders_app", "OrderStats")
+    rows = (
+        Order.objects.order_by()
+        .values("business_user")
+        .annotate(
+            in_progress_count=models.Count("pk", filter=models.Q(status="in_progress")),
+            completed_count=models.Count("pk", filter=models.Q(status="completed")),
+            cancelled_count=models.Count("pk", filter=models.Q(status="cancelled")),
+        )
+    )
+    OrderStats.objects.bulk_create(
+        [
+            OrderStats(
+                business_user_id=row["business_user"],
+                in_progress_count=row["in_progress_count"],
+                completed_count=row["completed_count"],
+                cancelled_count=row["cancelled_count"],
+            )
+            for row in rows
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_app", "0001_initial"),
+        ("orders_app", "0003_order_role_status_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderStats",
+            fields=[
+                (
+                    "business_user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="order_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("in_progress_count", models.PositiveIntegerField(default=0)),
+                ("completed_count", models.PositiveIntegerField(default=0)),
+                ("cancelled_count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_order_stats, migrations.RunPython.noop),
+    ]
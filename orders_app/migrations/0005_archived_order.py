@@ -0,0 +1,84 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders_app", "0004_order_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=255)),
+                ("revisions", models.PositiveIntegerField(default=0)),
+                ("delivery_time_in_days", models.PositiveIntegerField()),
+                (
+                    "price",
+                    models.DecimalField(decimal_places=2, max_digits=15, null=True),
+                ),
+                ("features", models.JSONField(blank=True, default=list)),
+                (
+                    "offer_type",
+                    models.CharField(
+                        choices=[
+                            ("basic", "Basic"),
+                            ("standard", "Standard"),
+                            ("premium", "Premium"),
+                        ],
+                        default="standard",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("in_progress", "In Progress"),
+                            ("completed", "Completed"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        max_length=12,
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "business_user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_business_orders",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "customer_user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_customer_orders",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["business_user", "status", "created_at"],
+                        name="archived_business_status_crtd",
+                    ),
+                    models.Index(
+                        fields=["customer_user", "status", "created_at"],
+                        name="archived_customer_status_crtd",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -1,4 +1,7 @@
-from django.db import models
+from collections import Counter
+from django.db import models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
 from auth_app.models import Account
 from offers_app.models import OfferType
 from offers_app.models import Offer
@@ -9,6 +12,17 @@ class StatusType(models.TextChoices):
     COMPLETED = 'completed', 'Completed'
     CANCELLED = 'cancelled', 'Cancelled'
 
+"""Allowed order status transitions: status -> statuses it may move to (completed and cancelled are final)."""
+ORDER_STATUS_TRANSITIONS = {
+    StatusType.IN_PROGRESS: {StatusType.COMPLETED, StatusType.CANCELLED},
+    StatusType.COMPLETED: set(),
+    StatusType.CANCELLED: set(),
+}
+
+# Return the statuses an order may be moved from into the target status.
+def transition_sources(target):
+    return [status for status, targets in ORDER_STATUS_TRANSITIONS.items() if target in targets]
+
 """Model for an order placed by a user."""
 class Order(models.Model):   
     customer_user = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='customer_orders', blank=False)
@@ -23,6 +37,135 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'status', 'created_at'], name='order_business_status_created'),
+            models.Index(fields=['customer_user', 'status', 'created_at'], name='order_customer_status_created'),
+        ]
+
+    # Remember the loaded business and status so the counter signals can tell what changed on save.
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_stats_key = instance.stats_key()
+        return instance
+
+    # The (business user id, status) pair an order is counted under in OrderStats.
+    def stats_key(self):
+        return self.__dict__.get('business_user_id'), self.__dict__.get('status')
+
+    # Return the order title.
+    def __str__(self):
+        return self.title
+
+"""Closed order moved out of the live orders table by the archive_orders command; keeps the original id."""
+class ArchivedOrder(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    customer_user = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='archived_customer_orders')
+    business_user = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='archived_business_orders')
+    title = models.CharField(max_length=255)
+    revisions = models.PositiveIntegerField(default=0)
+    delivery_time_in_days = models.PositiveIntegerField()
+    price = models.DecimalField(max_digits=15, decimal_places=2, blank=False, null=True)
+    features = models.JSONField(default=list, blank=True)
+    offer_type = models.CharField(max_length=10, choices=OfferType.choices, default=OfferType.STANDARD)
+    status = models.CharField(max_length=12, choices=StatusType.choices)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'status', 'created_at'], name='archived_business_status_crtd'),
+            models.Index(fields=['customer_user', 'status', 'created_at'], name='archived_customer_status_crtd'),
+        ]
+
     # Return the order title.
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+"""Order statuses that end an order's life cycle; only these are archived."""
+CLOSED_ORDER_STATUSES = [StatusType.COMPLETED, StatusType.CANCELLED]
+
+"""OrderStats counter column for each order status."""
+ORDER_STATS_FIELDS = {
+    StatusType.IN_PROGRESS: 'in_progress_count',
+    StatusType.COMPLETED: 'completed_count',
+    StatusType.CANCELLED: 'cancelled_count',
+}
+
+# Count the live and archived orders of every business user per status, as rows keyed by the OrderStats fields.
+def count_orders_by_business():
+    totals = {}
+    for model in (Order, ArchivedOrder):
+        rows = model.objects.order_by().values('business_user').annotate(**{
+            field: Count('pk', filter=Q(status=status)) for status, field in ORDER_STATS_FIELDS.items()
+        })
+        for row in rows:
+            counts = totals.setdefault(row['business_user'], Counter())
+            counts.update({field: row[field] for field in ORDER_STATS_FIELDS.values()})
+    return [{'business_user': business_user_id, **counts} for business_user_id, counts in totals.items()]
+
+"""Queryset helpers that keep the per-business order counters in step with order writes."""
+class OrderStatsQuerySet(models.QuerySet):
+
+    # Apply counter deltas given as [(business_user_id, status, delta), ...] with one UPDATE per business.
+    def adjust(self, changes):
+        per_business = {}
+        for business_user_id, status, delta in changes:
+            per_business.setdefault(business_user_id, Counter())[status] += delta
+
+        for business_user_id, deltas in per_business.items():
+            updates = {
+                ORDER_STATS_FIELDS[status]: Greatest(F(ORDER_STATS_FIELDS[status]) + delta, 0)
+                for status, delta in deltas.items() if delta and status in ORDER_STATS_FIELDS
+            }
+            if not updates or self.filter(pk=business_user_id).update(**updates):
+                continue
+            # No counter row yet: create it on increments only (decrements of a missing row, e.g. while the
+            # business account itself is being deleted, have nothing to count down).
+            if any(delta > 0 for delta in deltas.values()):
+                self.get_or_create(business_user_id=business_user_id)
+                self.filter(pk=business_user_id).update(**updates)
+
+    # Recompute all counters from the orders table in one transaction; returns the number of counter rows.
+    def rebuild(self):
+        stats = [
+            self.model(business_user_id=row['business_user'], **{field: row.get(field, 0) for field in ORDER_STATS_FIELDS.values()})
+            for row in count_orders_by_business()
+        ]
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(stats)
+        return len(stats)
+
+"""Per-business order counters (live and archived orders), maintained incrementally by the order signals."""
+class OrderStats(models.Model):
+    business_user = models.OneToOneField(Account, on_delete=models.CASCADE, primary_key=True, related_name='order_stats')
+    in_progress_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    cancelled_count = models.PositiveIntegerField(default=0)
+
+    objects = OrderStatsQuerySet.as_manager()
+
+    # Return the business user id the counters belong to.
+    def __str__(self):
+        return f'Order stats of {self.business_user_id}'
+
+"""Stored response of an order request made with an Idempotency-Key header, replayed on retries."""
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField()
+    response_body = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user'),
+        ]
+
+    # Return the idempotency key.
+    def __str__(self):
+        return self.key
\ No newline at end of file
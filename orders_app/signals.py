@@ -0,0 +1,39 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from orders_app.models import Order, OrderStats
+
+"""Set while orders leave the table without leaving the counters (e.g. when they are archived)."""
+_counting_suspended = ContextVar('order_counting_suspended', default=False)
+
+# Delete orders inside this block without counting them down in OrderStats.
+@contextmanager
+def order_counting_suspended():
+    token = _counting_suspended.set(True)
+    try:
+        yield
+    finally:
+        _counting_suspended.reset(token)
+
+# Count new orders and move changed ones between counters (status changes touch one counter row).
+@receiver(post_save, sender=Order)
+def count_saved_order(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = instance.stats_key()
+    previous = getattr(instance, '_loaded_stats_key', None)
+
+    if created:
+        OrderStats.objects.adjust([(*current, 1)])
+    elif previous is not None and previous != current:
+        OrderStats.objects.adjust([(*previous, -1), (*current, 1)])
+    instance._loaded_stats_key = current
+
+# Deleted orders are counted down under the status they were stored with (unless counting is suspended).
+@receiver(post_delete, sender=Order)
+def count_deleted_order(sender, instance, **kwargs):
+    if _counting_suspended.get():
+        return
+    previous = getattr(instance, '_loaded_stats_key', None) or instance.stats_key()
+    OrderStats.objects.adjust([(*previous, -1)])
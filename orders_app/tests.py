@@ -0,0 +1,242 @@
+import io
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from auth_app.models import Account
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import IdempotencyKey, Order, OrderStats
+
+"""A business user with one offer, a customer, and API clients for both."""
+class OrderTestCase(TestCase):
+
+    def setUp(self):
+        self.business = self.create_account('business', Account.BUSINESS)
+        self.customer = self.create_account('customer', Account.CUSTOMER)
+        offer = Offer.objects.create(user=self.business, title='Logo')
+        self.detail = OfferDetail.objects.create(offer=offer, title='Logo basic', revisions=1, delivery_time_in_days=3, price=100, features=['draft'], offer_type='basic')
+        self.business_client = self.client_for(self.business)
+        self.customer_client = self.client_for(self.customer)
+
+    # Create an account.
+    def create_account(self, username, user_type):
+        return Account.objects.create_user(username=username, password='secret-pw-123', user_type=user_type)
+
+    # API client authenticated as the account.
+    def client_for(self, account):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=account).key}')
+        return client
+
+    # Place an order for the offer detail as the customer and return the response.
+    def place_order(self, **headers):
+        return self.customer_client.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', headers=headers)
+
+
+"""Order creation with an Idempotency-Key replays the first response and rejects reuse for other requests."""
+class IdempotentOrderCreationTests(OrderTestCase):
+
+    def test_retry_replays_the_stored_response(self):
+        first = self.place_order(**{'Idempotency-Key': 'checkout-1'})
+        retry = self.place_order(**{'Idempotency-Key': 'checkout-1'})
+
+        self.assertEqual((first.status_code, retry.status_code), (201, 201))
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_key_reused_for_another_request_is_rejected(self):
+        self.place_order(**{'Idempotency-Key': 'checkout-1'})
+        other = OfferDetail.objects.create(offer=self.detail.offer, title='Logo premium', delivery_time_in_days=1, price=300, offer_type='premium')
+        response = self.customer_client.post('/api/orders/', {'offer_detail_id': other.pk}, format='json', headers={'Idempotency-Key': 'checkout-1'})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_keys_are_scoped_per_user(self):
+        self.place_order(**{'Idempotency-Key': 'checkout-1'})
+        other_customer = self.client_for(self.create_account('other', Account.CUSTOMER))
+        response = other_customer.post('/api/orders/', {'offer_detail_id': self.detail.pk}, format='json', headers={'Idempotency-Key': 'checkout-1'})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertEqual(IdempotencyKey.objects.count(), 2)
+
+    def test_without_key_every_request_creates_an_order(self):
+        self.place_order()
+        self.place_order()
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_oversized_key_is_rejected(self):
+        response = self.place_order(**{'Idempotency-Key': 'k' * 256})
+        self.assertEqual(response.status_code, 400)
+
+
+"""The order list pages through the user's orders newest first, with ties broken by id."""
+class OrderListTests(OrderTestCase):
+
+    # Five orders sharing one created_at, so only the id tiebreaker orders them.
+    def setUp(self):
+        super().setUp()
+        self.order_ids = [self.place_order().data['id'] for _ in range(5)]
+        Order.objects.update(created_at=timezone.now())
+
+    # Follow the next (or previous) links from a URL and return the ids of every page.
+    def walk(self, url, direction='next'):
+        pages = []
+        while url:
+            response = self.customer_client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            pages.append([order['id'] for order in response.data['results']])
+            last_url, url = url, response.data[direction]
+        return pages, last_url
+
+    def test_cursor_pages_break_ties_by_id_in_both_directions(self):
+        pages, last_url = self.walk('/api/orders/?pagination=cursor&page_size=2')
+        self.assertEqual(pages, [self.order_ids[4:2:-1], self.order_ids[2:0:-1], self.order_ids[:1]])
+
+        backwards, _ = self.walk(last_url, direction='previous')
+        self.assertEqual(backwards, pages[::-1])
+
+    def test_status_filter_and_other_users(self):
+        for order_id in self.order_ids[:2]:
+            self.business_client.patch(f'/api/orders/{order_id}/', {'status': 'completed'}, format='json')
+
+        response = self.customer_client.get('/api/orders/?status=completed')
+        self.assertEqual([order['id'] for order in response.data], self.order_ids[1::-1])
+        self.assertEqual(self.customer_client.get('/api/orders/?status=done').status_code, 400)
+
+        stranger = self.client_for(self.create_account('stranger', Account.CUSTOMER))
+        self.assertEqual(stranger.get('/api/orders/').data, [])
+
+    @override_settings(ORDERS_MAX_PAGE_SIZE=3)
+    def test_default_list_is_capped_with_next_link(self):
+        response = self.customer_client.get('/api/orders/')
+        self.assertEqual([order['id'] for order in response.data], self.order_ids[:1:-1])
+
+        next_url = response['Link'].split(';')[0].strip('<>')
+        pages, _ = self.walk(next_url)
+        self.assertEqual(pages, [self.order_ids[1::-1]])
+
+    def test_archived_orders_are_merged_on_request(self):
+        for order_id in self.order_ids[1:3]:
+            self.business_client.patch(f'/api/orders/{order_id}/', {'status': 'cancelled'}, format='json')
+        call_command('archive_orders', older_than_days=0, stdout=io.StringIO())
+
+        live = self.customer_client.get('/api/orders/').data
+        self.assertEqual([order['id'] for order in live], [self.order_ids[index] for index in (4, 3, 0)])
+
+        pages, _ = self.walk('/api/orders/?pagination=cursor&page_size=2&include_archived=true')
+        self.assertEqual([order_id for page in pages for order_id in page], self.order_ids[::-1])
+
+
+"""The per-business order counters follow creation, status changes, deletion and archiving."""
+class OrderStatsTests(OrderTestCase):
+
+    # The business user's counters as served by the API: (in progress, completed, cancelled).
+    def counters(self):
+        data = self.customer_client.get(f'/api/order-stats/{self.business.pk}/').data
+        return data['in_progress_count'], data['completed_count'], data['cancelled_count']
+
+    # Output of rebuild_order_stats --verify.
+    def verify_output(self):
+        output = io.StringIO()
+        call_command('rebuild_order_stats', verify=True, stdout=output)
+        return output.getvalue()
+
+    # Move an order to a status as the business user.
+    def move(self, order_id, target):
+        return self.business_client.patch(f'/api/orders/{order_id}/', {'status': target}, format='json')
+
+    def test_status_changes_move_one_order_between_counters(self):
+        order_ids = [self.place_order().data['id'] for _ in range(3)]
+        self.assertEqual(self.counters(), (3, 0, 0))
+
+        self.move(order_ids[0], 'completed')
+        self.move(order_ids[1], 'cancelled')
+        self.assertEqual(self.counters(), (1, 1, 1))
+
+        # Closed orders cannot move again, so the counters stay put.
+        self.assertEqual(self.move(order_ids[0], 'cancelled').status_code, 400)
+        self.assertEqual(self.counters(), (1, 1, 1))
+        self.assertIn('up to date', self.verify_output())
+
+    def test_repeated_admin_delete_counts_down_once(self):
+        order_id = self.place_order().data['id']
+        self.place_order()
+        admin = self.create_account('admin', Account.CUSTOMER)
+        admin.is_staff = True
+        admin.save()
+        admin_client = self.client_for(admin)
+
+        responses = [admin_client.delete(f'/api/orders/{order_id}/') for _ in range(2)]
+        self.assertEqual([response.status_code for response in responses], [204, 404])
+        self.assertEqual(self.counters(), (1, 0, 0))
+
+    def test_archived_orders_stay_counted(self):
+        order_ids = [self.place_order().data['id'] for _ in range(2)]
+        self.move(order_ids[0], 'completed')
+        call_command('archive_orders', older_than_days=0, stdout=io.StringIO())
+
+        self.assertFalse(Order.objects.filter(pk=order_ids[0]).exists())
+        self.assertEqual(self.counters(), (1, 1, 0))
+        self.assertIn('up to date', self.verify_output())
+
+    def test_verify_reports_and_rebuild_repairs_drift(self):
+        self.place_order()
+        OrderStats.objects.filter(business_user=self.business).update(in_progress_count=5)
+        self.assertIn('stale order counters', self.verify_output())
+
+        call_command('rebuild_order_stats', stdout=io.StringIO())
+        self.assertEqual(self.counters(), (1, 0, 0))
+        self.assertIn('up to date', self.verify_output())
+
+
+"""Bulk status updates report an outcome per id and keep the counters in step."""
+class OrderBulkStatusTests(OrderTestCase):
+
+    # Bulk update as the given client.
+    def bulk(self, client, ids, target):
+        return client.patch('/api/orders/bulk-status/', {'ids': ids, 'status': target}, format='json')
+
+    # The business user's stored counters: (in progress, completed, cancelled).
+    def counters(self):
+        stats = OrderStats.objects.get(business_user=self.business)
+        return stats.in_progress_count, stats.completed_count, stats.cancelled_count
+
+    def test_results_per_id_and_counters(self):
+        order_ids = [self.place_order().data['id'] for _ in range(3)]
+        self.business_client.patch(f'/api/orders/{order_ids[2]}/', {'status': 'cancelled'}, format='json')
+        other_business = self.create_account('other', Account.BUSINESS)
+        other_offer = Offer.objects.create(user=other_business, title='Website')
+        other_detail = OfferDetail.objects.create(offer=other_offer, title='Website basic', delivery_time_in_days=5, price=500, offer_type='basic')
+        foreign_id = self.customer_client.post('/api/orders/', {'offer_detail_id': other_detail.pk}, format='json').data['id']
+
+        response = self.bulk(self.business_client, [order_ids[0], order_ids[1], order_ids[0], order_ids[2], foreign_id, 999999], 'completed')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(
+            [result['result'] for result in response.data['results']],
+            ['updated', 'updated', 'invalid_transition', 'forbidden', 'not_found']
+        )
+        self.assertEqual(self.counters(), (0, 2, 1))
+        self.assertEqual(Order.objects.get(pk=foreign_id).status, 'in_progress')
+
+        # Repeating the request changes nothing.
+        repeated = self.bulk(self.business_client, order_ids[:2], 'completed')
+        self.assertEqual([result['result'] for result in repeated.data['results']], ['unchanged', 'unchanged'])
+        self.assertEqual(self.counters(), (0, 2, 1))
+
+    def test_customers_cannot_bulk_update(self):
+        order_id = self.place_order().data['id']
+        response = self.bulk(self.customer_client, [order_id], 'completed')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Order.objects.get(pk=order_id).status, 'in_progress')
+
+    def test_rejects_empty_ids_and_unknown_status(self):
+        self.assertEqual(self.bulk(self.business_client, [], 'completed').status_code, 400)
+        self.assertEqual(self.bulk(self.business_client, [1], 'shipped').status_code, 400)
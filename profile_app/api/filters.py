@@ -0,0 +1,33 @@
+from django.db.models import Q
+
+"""Directory orderings by join date, each with a user id tiebreaker."""
+PROFILE_ORDERINGS = {
+    'date_joined': ('user__date_joined', 'user_id'),
+    '-date_joined': ('-user__date_joined', '-user_id'),
+}
+
+"""Business directory orderings: join date or average rating (profiles without reviews sort last)."""
+BUSINESS_PROFILE_ORDERINGS = {
+    **PROFILE_ORDERINGS,
+    'rating': ('user__rating_summary__average_rating', 'user_id'),
+    '-rating': ('-user__rating_summary__average_rating', '-user_id'),
+}
+
+DEFAULT_PROFILE_ORDERING = '-date_joined'
+
+# Case-insensitive search on username, first and last name and location.
+def apply_profile_search(queryset, params):
+    search = params.get('search', '').strip()
+    if not search:
+        return queryset
+    return queryset.filter(
+        Q(user__username__icontains=search) | Q(user__first_name__icontains=search) |
+        Q(user__last_name__icontains=search) | Q(location__icontains=search)
+    )
+
+# Return the ordering keys for the ordering parameter out of the supported orderings.
+def get_profile_ordering(ordering, orderings):
+    ordering = ordering or DEFAULT_PROFILE_ORDERING
+    if ordering not in orderings:
+        raise ValueError(f"Invalid value for ordering. Must be one of {', '.join(orderings)}.")
+    return orderings[ordering]
@@ -1,5 +1,11 @@
 from rest_framework import serializers
 from profile_app.models import Profile
+from core.images import schedule_variants, variant_urls
+from core.fieldsets import DynamicFieldsMixin
+from core.uploads import max_upload_size_label
+from django.conf import settings
+from auth_app.models import Account
+from reviews_app.api.serializers import BusinessRatingSummarySerializer, rating_summary_of
 import os
 
 """Serializer for retrieving a single user profile."""
@@ -12,10 +18,12 @@ class ProfileSingleSerializer(serializers.ModelSerializer):
     type = serializers.CharField(source='user.user_type')
     email = serializers.EmailField(source='user.email')
     created_at = serializers.DateTimeField(source='user.date_joined')
+    file_variants = serializers.SerializerMethodField()
+    rating_summary = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file','location', 'tel', 'description', 'working_hours', 'type', 'email', 'created_at']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'location', 'tel', 'description', 'working_hours', 'type', 'email', 'created_at', 'rating_summary']
         read_only_fields = fields
 
     # Return file URL if present.
@@ -24,6 +32,16 @@ class ProfileSingleSerializer(serializers.ModelSerializer):
             return obj.file.url
         return None
 
+    # Return URLs of the resized image variants.
+    def get_file_variants(self, obj):
+        return variant_urls(obj.file, self.context.get('request'))
+
+    # Return the rating summary of business users (None for customers).
+    def get_rating_summary(self, obj):
+        if obj.user.user_type != Account.BUSINESS:
+            return None
+        return BusinessRatingSummarySerializer(rating_summary_of(obj.user)).data
+
 """Serializer for updating a single user profile."""
 class ProfileSinglePatchSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(source='user.first_name', required=False)
@@ -35,10 +53,10 @@ class ProfileSinglePatchSerializer(serializers.ModelSerializer):
         model = Profile
         fields = ['first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'email']
 
-    # Validate uploaded file size.
+    # Validate uploaded file size (larger request bodies are already stopped by MaxSizeUploadHandler).
     def validate_file(self, value):
-        if value.size > 5 * 1024 * 1024:
-            raise serializers.ValidationError("The file must not be larger than 5 MB.")
+        if value.size > settings.UPLOAD_MAX_FILE_SIZE:
+            raise serializers.ValidationError(f"The file must not be larger than {max_upload_size_label()}.")
         return value
     
     # Return file name if present.
@@ -55,6 +73,9 @@ class ProfileSinglePatchSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
 
+        if 'file' in validated_data:
+            schedule_variants(instance.file)
+
         user = instance.user
         for attr, value in user_data.items():
             setattr(user, attr, value)
@@ -62,19 +83,22 @@ class ProfileSinglePatchSerializer(serializers.ModelSerializer):
 
         return instance
 
-"""Serializer for listing business user profiles."""
-class ProfilesBusinessSerializer(serializers.ModelSerializer):
+"""Serializer for listing business user profiles; supports sparse fieldsets."""
+class ProfilesBusinessSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = serializers.IntegerField(source='user.id')
     username = serializers.CharField(source='user.username')
     first_name = serializers.CharField(source='user.first_name')
     last_name = serializers.CharField(source='user.last_name')    
     file = serializers.SerializerMethodField()
     type = serializers.CharField(source='user.user_type')
+    file_variants = serializers.SerializerMethodField()
+    rating_summary = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'type']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'location', 'tel', 'description', 'working_hours', 'type', 'rating_summary']
         read_only_fields = fields
+        field_dependencies = {'file': ['file'], 'file_variants': ['file', 'file_variant_set'], 'rating_summary': ['user.rating_summary']}
 
     # Return file URL if present.
     def get_file(self, obj):
@@ -82,22 +106,36 @@ class ProfilesBusinessSerializer(serializers.ModelSerializer):
             return obj.file.url
         return None
 
-"""Serializer for listing customer user profiles."""
-class ProfilesCustomerSerializer(serializers.ModelSerializer):
+    # Return URLs of the resized image variants.
+    def get_file_variants(self, obj):
+        return variant_urls(obj.file, self.context.get('request'))
+
+    # Return the rating summary of the business user.
+    def get_rating_summary(self, obj):
+        return BusinessRatingSummarySerializer(rating_summary_of(obj.user)).data
+
+"""Serializer for listing customer user profiles; supports sparse fieldsets."""
+class ProfilesCustomerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = serializers.IntegerField(source='user.id')
     username = serializers.CharField(source='user.username')
     first_name = serializers.CharField(source='user.first_name')
     last_name = serializers.CharField(source='user.last_name')    
     file = serializers.SerializerMethodField()
     type = serializers.CharField(source='user.user_type')
+    file_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'type']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'uploaded_at', 'type']
         read_only_fields = fields
+        field_dependencies = {'file': ['file'], 'file_variants': ['file', 'file_variant_set']}
 
     # Return file URL if present.
     def get_file(self, obj):
         if obj.file:
             return obj.file.url
-        return None
\ No newline at end of file
+        return None
+
+    # Return URLs of the resized image variants.
+    def get_file_variants(self, obj):
+        return variant_urls(obj.file, self.context.get('request'))
\ No newline at end of file
@@ -1,5 +1,3 @@
-from django.conf import settings
-from django.conf.urls.static import static
 from django.urls import path
 from .views import ProfileSingleView, ProfilesBusinessView, ProfilesCustomerView
 
@@ -8,6 +6,4 @@ urlpatterns = [
     path('profile/<int:pk>/', ProfileSingleView.as_view(), name='profile-detail'),
     path('profiles/business/', ProfilesBusinessView.as_view()),
     path('profiles/customer/', ProfilesCustomerView.as_view())
-]
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+]
\ No newline at end of file
@@ -4,15 +4,26 @@ from rest_framework.response import Response
 from rest_framework import status
 from .serializers import ProfileSingleSerializer, ProfileSinglePatchSerializer, ProfilesBusinessSerializer, ProfilesCustomerSerializer
 from profile_app.models import Profile
+from core.conditional import conditional_get
+from django.db.models.functions import Coalesce, Greatest
+from django.conf import settings
+from rest_framework.utils.urls import replace_query_param
+from auth_app.models import Account
+from core.pagination import CursorPaginator, InvalidCursor, next_page_link
+from core.fieldsets import ordering_paths, sparse_fieldset
+from .filters import BUSINESS_PROFILE_ORDERINGS, PROFILE_ORDERINGS, apply_profile_search, get_profile_ordering
 
 """Retrieve or update a single user profile."""
 class ProfileSingleView(APIView):
     permission_classes = [IsAuthenticated]
     
-    # Get a single profile by user ID.
+    # Get a single profile by user ID; unchanged profiles (including their rating summary) are answered with 304.
+    @conditional_get(lambda pk: Profile.objects.filter(pk=pk).annotate(
+        modified=Greatest('uploaded_at', Coalesce('user__rating_summary__updated_at', 'uploaded_at'))
+    ).values_list('modified', flat=True).first())
     def get(self, request, pk):
         try:
-            profile = Profile.objects.get(user__pk=pk)
+            profile = Profile.objects.select_related('user', 'user__rating_summary').get(user__pk=pk)
         except Profile.DoesNotExist:
             return Response({"detail": "Profile not found."}, status=status.HTTP_404_NOT_FOUND)
         
@@ -36,31 +47,75 @@ class ProfileSingleView(APIView):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-"""List all business user profiles."""
-class ProfilesBusinessView(APIView):
+"""
+Base view of the profile directories: profiles of one user type, searchable and ordered, loading only
+what the requested fields (?fields= / ?omit=) read. Returns a plain list, or keyset pages with pagination=cursor.
+"""
+class ProfileDirectoryView(APIView):
     permission_classes = [IsAuthenticated]
+    user_type = None
+    serializer_class = None
+    orderings = PROFILE_ORDERINGS
 
-    # Get all business profiles.
+    # List the profiles of the directory's user type.
     def get(self, request):
         try:
-            profiles = Profile.objects.filter(user__user_type="business")
-        except Profile.DoesNotExist:
-            return Response({"detail": "Profile not found."}, status=status.HTTP_404_NOT_FOUND)
+            keys = get_profile_ordering(request.query_params.get('ordering'), self.orderings)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = ProfilesBusinessSerializer(profiles, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fieldset = sparse_fieldset(request)
+        profiles = Profile.objects.filter(user__user_type=self.user_type)
+        profiles = apply_profile_search(profiles, request.query_params)
 
+        # Cursors are built from the ordering keys, so those are loaded even when not requested.
+        profiles = self.serializer_class(**fieldset).prune_queryset(profiles, required=ordering_paths(keys))
 
-"""List all customer user profiles."""
-class ProfilesCustomerView(APIView):
-    permission_classes = [IsAuthenticated]
+        if self.is_cursor_mode(request):
+            return self.get_cursor_page(request, profiles, keys, fieldset)
 
-    # Get all customer profiles.
-    def get(self, request):
+        # Without a cursor the plain list is capped at PROFILES_MAX_PAGE_SIZE; the Link header continues it.
+        page = CursorPaginator(profiles, keys, settings.PROFILES_MAX_PAGE_SIZE).page()
+        serializer = self.serializer_class(page.object_list, many=True, context={'request': request}, **fieldset)
+        return Response(serializer.data, status=status.HTTP_200_OK, headers=next_page_link(request, page))
+
+    # Cursor mode is used when a cursor is passed or requested with pagination=cursor.
+    def is_cursor_mode(self, request):
+        return 'cursor' in request.query_params or request.query_params.get('pagination') == 'cursor'
+
+    # List one keyset page of profiles without COUNT(*); next/previous links keep search and ordering.
+    def get_cursor_page(self, request, profiles, keys, fieldset):
         try:
-            profiles = Profile.objects.filter(user__user_type="customer")
-        except Profile.DoesNotExist:
-            return Response({"detail": "Profile not found."}, status=status.HTTP_404_NOT_FOUND)
+            page_size = int(request.query_params.get('page_size', 12))
+        except ValueError:
+            return Response({'error': 'Invalid value for page_size. Must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        if page_size < 1:
+            return Response({'error': 'page_size must be a positive integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        page_size = min(page_size, settings.PROFILES_MAX_PAGE_SIZE)
+
+        try:
+            page = CursorPaginator(profiles, keys, page_size).page(request.query_params.get('cursor'))
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.serializer_class(page.object_list, many=True, context={'request': request}, **fieldset)
+
+        url = request.build_absolute_uri()
+        return Response({
+            'next': replace_query_param(url, 'cursor', page.next_cursor) if page.next_cursor else None,
+            'previous': replace_query_param(url, 'cursor', page.previous_cursor) if page.previous_cursor else None,
+            'results': serializer.data
+        }, status=status.HTTP_200_OK)
+
+
+"""List business user profiles, orderable by join date or rating."""
+class ProfilesBusinessView(ProfileDirectoryView):
+    user_type = Account.BUSINESS
+    serializer_class = ProfilesBusinessSerializer
+    orderings = BUSINESS_PROFILE_ORDERINGS
+
 
-        serializer = ProfilesCustomerSerializer(profiles, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+"""List customer user profiles, orderable by join date."""
+class ProfilesCustomerView(ProfileDirectoryView):
+    user_type = Account.CUSTOMER
+    serializer_class = ProfilesCustomerSerializer
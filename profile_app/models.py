@@ -6,6 +6,7 @@ class Profile(models.Model):
     user = models.OneToOneField(Account, on_delete=models.CASCADE, primary_key=True, related_name='profile')
     description = models.TextField(blank=True, default="")
     file = models.FileField(upload_to='', blank=True, null=True)
+    file_variant_set = models.JSONField(default=dict, blank=True, editable=False)
     uploaded_at = models.DateTimeField(auto_now=True)
     location = models.CharField(max_length=255, blank=True, default="")
     tel = models.CharField(max_length=20, blank=True, default="")
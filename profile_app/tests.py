@@ -0,0 +1,95 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from auth_app.models import Account
+from core.images import IMAGE_VARIANTS, record_variants
+from profile_app.api.filters import BUSINESS_PROFILE_ORDERINGS, PROFILE_ORDERINGS
+from profile_app.models import Profile
+from reviews_app.models import Review
+
+"""The profile directories load every page with one query, whatever the ordering, cursor mode or fieldset."""
+class ProfileDirectoryQueryCountTests(TestCase):
+
+    # Three rated and one unrated business, two customers, and a client authenticated as a customer.
+    @classmethod
+    def setUpTestData(cls):
+        businesses = [cls.create_account(f'business{index}', Account.BUSINESS) for index in range(4)]
+        customers = [cls.create_account(f'customer{index}', Account.CUSTOMER) for index in range(2)]
+        for business, rating in zip(businesses, [5, 3, 4]):
+            Review.objects.create(business_user=business, reviewer=customers[0], rating=rating)
+        cls.token = Token.objects.create(user=customers[1])
+
+    # Create an account with its profile.
+    @classmethod
+    def create_account(cls, username, user_type):
+        account = Account.objects.create_user(username=username, password='secret-pw-123', user_type=user_type)
+        Profile.objects.create(user=account)
+        return account
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        # Warm the token cache so only the directory queries are counted.
+        self.client.get('/api/profiles/customer/')
+
+    # Request a URL and return the response with the number of queries it ran.
+    def get_counted(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response, len(queries)
+
+    def test_business_directory_orderings(self):
+        for ordering in BUSINESS_PROFILE_ORDERINGS:
+            for suffix in ('', '&pagination=cursor&page_size=2', '&fields=username,rating_summary', '&omit=rating_summary'):
+                with self.subTest(ordering=ordering, suffix=suffix):
+                    response, count = self.get_counted(f'/api/profiles/business/?ordering={ordering}{suffix}')
+                    self.assertEqual(count, 1)
+
+    def test_customer_directory_orderings(self):
+        for ordering in PROFILE_ORDERINGS:
+            for suffix in ('', '&pagination=cursor&page_size=1', '&fields=username'):
+                with self.subTest(ordering=ordering, suffix=suffix):
+                    response, count = self.get_counted(f'/api/profiles/customer/?ordering={ordering}{suffix}')
+                    self.assertEqual(count, 1)
+
+    def test_rating_ordering_follows_cursor_pages(self):
+        response, count = self.get_counted('/api/profiles/business/?ordering=-rating&pagination=cursor&page_size=2')
+        usernames = [profile['username'] for profile in response.data['results']]
+        while response.data['next']:
+            response, count = self.get_counted(response.data['next'])
+            self.assertEqual(count, 1)
+            usernames += [profile['username'] for profile in response.data['results']]
+        self.assertEqual(usernames, ['business0', 'business2', 'business1', 'business3'])
+
+    @override_settings(PROFILES_MAX_PAGE_SIZE=3)
+    def test_default_list_is_capped_with_next_link(self):
+        response, count = self.get_counted('/api/profiles/business/?ordering=-rating')
+        self.assertEqual([profile['username'] for profile in response.data], ['business0', 'business2', 'business1'])
+        next_url = response['Link'].split(';')[0].strip('<>')
+        response, count = self.get_counted(next_url)
+        self.assertEqual([profile['username'] for profile in response.data['results']], ['business3'])
+        self.assertIsNone(response.data['next'])
+
+
+"""Recording image variants changes the profile's validator, so clients revalidating a copy without them get a 200."""
+class ProfileVariantRevalidationTests(TestCase):
+
+    def setUp(self):
+        self.account = Account.objects.create_user(username='pictured', password='secret-pw-123', user_type=Account.CUSTOMER)
+        self.profile = Profile.objects.create(user=self.account, file='me.png')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.account).key}')
+
+    def test_revalidation_after_variants_are_recorded(self):
+        url = f'/api/profile/{self.account.pk}/'
+        response = self.client.get(url)
+        self.assertEqual(response.data['file_variants'], {})
+
+        record_variants(Profile.objects.get(pk=self.account.pk).file, IMAGE_VARIANTS)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['file_variants']), set(IMAGE_VARIANTS))
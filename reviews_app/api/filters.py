@@ -0,0 +1,50 @@
+from auth_app.models import Account
+from reviews_app.models import Review
+
+"""Supported values for the ordering query parameter, each with an id tiebreaker."""
+REVIEW_ORDERINGS = {
+    'updated_at': ('updated_at', 'id'),
+    '-updated_at': ('-updated_at', '-id'),
+    'rating': ('rating', 'id'),
+    '-rating': ('-rating', '-id'),
+}
+
+DEFAULT_REVIEW_ORDERING = '-updated_at'
+
+# Reviews of a user: received ones for business users, written ones for customers.
+def reviews_for_user(user):
+    if user.user_type == Account.BUSINESS:
+        return Review.objects.filter(business_user=user)
+    if user.user_type == Account.CUSTOMER:
+        return Review.objects.filter(reviewer=user)
+
+    # Users without a role (e.g. staff) may appear on either side: UNION two index scans instead of an OR.
+    ids = Review.objects.filter(business_user=user).values('pk').union(
+        Review.objects.filter(reviewer=user).values('pk')
+    )
+    return Review.objects.filter(pk__in=ids)
+
+# Filter reviews by business user and reviewer; both filters lead a composite index.
+def apply_review_filters(queryset, params):
+    business_user_id = params.get('business_user_id')
+    if business_user_id:
+        try:
+            queryset = queryset.filter(business_user_id=int(business_user_id))
+        except ValueError:
+            raise ValueError("Invalid value for business_user_id. Must be an integer.")
+
+    reviewer_id = params.get('reviewer_id')
+    if reviewer_id:
+        try:
+            queryset = queryset.filter(reviewer_id=int(reviewer_id))
+        except ValueError:
+            raise ValueError("Invalid value for reviewer_id. Must be an integer.")
+
+    return queryset
+
+# Return the ordering keys for the ordering parameter.
+def get_review_ordering(ordering):
+    ordering = ordering or DEFAULT_REVIEW_ORDERING
+    if ordering not in REVIEW_ORDERINGS:
+        raise ValueError(f"Invalid value for ordering. Must be one of {', '.join(REVIEW_ORDERINGS)}.")
+    return REVIEW_ORDERINGS[ordering]
@@ -1,10 +1,12 @@
 from rest_framework import serializers
 from auth_app.models import Account
-from reviews_app.models import Review
+from reviews_app.models import BusinessRatingSummary, Review
 from rest_framework.exceptions import PermissionDenied, ValidationError
+from django.db import IntegrityError, transaction
+from core.fieldsets import DynamicFieldsMixin
 
-"""Serializer for creating and validating reviews."""
-class ReviewSerializer(serializers.ModelSerializer):
+"""Serializer for creating and validating reviews; supports sparse fieldsets."""
+class ReviewSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     business_user = serializers.PrimaryKeyRelatedField(queryset=Account.objects.filter(user_type=Account.BUSINESS))
     reviewer = serializers.PrimaryKeyRelatedField(read_only=True)
    
@@ -22,6 +24,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         
         business_user_id = attrs.get('business_user', None)
 
+        # Index probe on the (reviewer, business_user) unique constraint.
         if Review.objects.filter(reviewer=user, business_user=business_user_id).exists():
             raise serializers.ValidationError("You have already reviewed this business profile.")
         return attrs
@@ -32,15 +35,37 @@ class ReviewSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("The selected user is not a business account.")
         return value
 
-    # Set reviewer to the current user.
+    # Set reviewer to the current user; the unique constraint catches a concurrent duplicate.
     def create(self, validated_data):
         validated_data['reviewer'] = self.context['request'].user
 
-        return super().create(validated_data)
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError("You have already reviewed this business profile.")
 
 """Serializer for updating a review."""
 class ReviewSinglePatchSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = ['id', 'business_user', 'reviewer', 'rating', 'description', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'business_user', 'reviewer', 'created_at', 'updated_at']
\ No newline at end of file
+        read_only_fields = ['id', 'business_user', 'reviewer', 'created_at', 'updated_at']
+
+"""Serializer for the rating summary of a business user."""
+class BusinessRatingSummarySerializer(serializers.ModelSerializer):
+    average_rating = serializers.FloatField(read_only=True)
+    rating_counts = serializers.DictField(source='histogram', child=serializers.IntegerField(), read_only=True)
+
+    class Meta:
+        model = BusinessRatingSummary
+        fields = ['business_user', 'review_count', 'average_rating', 'rating_counts']
+        read_only_fields = fields
+
+
+# Return the stored rating summary of a business account, or an empty one when it has no reviews yet.
+def rating_summary_of(account):
+    try:
+        return account.rating_summary
+    except BusinessRatingSummary.DoesNotExist:
+        return BusinessRatingSummary(business_user=account)
@@ -1,8 +1,10 @@
 from django.urls import path
-from .views import ReviewsView, ReviewSingleView
+from .views import ReviewsView, ReviewSingleView, ReviewExportView, BusinessRatingSummaryView
 
 """ URL patterns for review list and detail endpoints. """
 urlpatterns = [
     path('reviews/', ReviewsView.as_view()),
-    path('reviews/<int:id>/', ReviewSingleView.as_view(), name='review-detail')
+    path('reviews/export/', ReviewExportView.as_view(), name='review-export'),
+    path('reviews/<int:id>/', ReviewSingleView.as_view(), name='review-detail'),
+    path('rating-summary/<int:business_user_id>/', BusinessRatingSummaryView.as_view(), name='rating-summary')
 ]
\ No newline at end of file
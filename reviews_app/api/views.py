@@ -1,88 +1,146 @@
 from auth_app.models import Account
 from rest_framework import status
-from rest_framework.exceptions import ValidationError, PermissionDenied
+from rest_framework.utils.urls import replace_query_param
+from django.conf import settings
+from django.db import transaction
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from reviews_app.models import Review
-from .serializers import ReviewSerializer, ReviewSinglePatchSerializer
+from .serializers import BusinessRatingSummarySerializer, ReviewSerializer, ReviewSinglePatchSerializer, rating_summary_of
+from django.shortcuts import get_object_or_404
+from core.pagination import CursorPaginator, InvalidCursor, next_page_link
+from core.fieldsets import ordering_paths, sparse_fieldset
+from .filters import apply_review_filters, get_review_ordering, reviews_for_user
+from core.export import EXPORT_FORMATS, ExportMixin, get_export_format, iterate_rows, stream_export
 
 """List or create reviews."""
 class ReviewsView(APIView):
     permission_classes = [IsAuthenticated]
 
-    # List reviews with optional filters.
+    # List reviews filtered by business_user_id or reviewer_id and ordered by updated_at or rating; ?fields= / ?omit= trim the payload.
     def get(self, request):
+        ordering = request.query_params.get('ordering')
         try:
-            business_user_id = request.query_params.get('business_user_id')
-            reviewer_id = request.query_params.get('reviewer_id')
-            ordering = request.query_params.get('ordering')
-            
-            reviews = Review.objects.all()
+            reviews = apply_review_filters(Review.objects.all(), request.query_params)
+            keys = get_review_ordering(ordering)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-            if business_user_id:
-                reviews = reviews.filter(business_user=business_user_id)
+        fieldset = sparse_fieldset(request)
+        reviews = ReviewSerializer(**fieldset).prune_queryset(reviews, required=ordering_paths(keys))
 
-            if reviewer_id:
-                reviews = reviews.filter(reviewer_id=reviewer_id)
+        if self.is_cursor_mode(request):
+            return self.get_cursor_page(request, reviews, keys, fieldset)
 
-            if ordering in ['updated_at', 'rating']:
-                reviews = reviews.order_by(ordering)
+        # Without a cursor the plain list is capped at REVIEWS_MAX_PAGE_SIZE; the Link header continues it.
+        page = CursorPaginator(reviews, keys, settings.REVIEWS_MAX_PAGE_SIZE).page()
+        serializer = ReviewSerializer(page.object_list, many=True, **fieldset)
+        return Response(serializer.data, status=status.HTTP_200_OK, headers=next_page_link(request, page))
 
-            serializer = ReviewSerializer(reviews, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        
-        except Exception as e:
+    # Cursor mode is used when a cursor is passed or requested with pagination=cursor.
+    def is_cursor_mode(self, request):
+        return 'cursor' in request.query_params or request.query_params.get('pagination') == 'cursor'
+
+    # List one keyset page of reviews without COUNT(*); next/previous links keep all filters.
+    def get_cursor_page(self, request, reviews, keys, fieldset):
+        try:
+            page_size = int(request.query_params.get('page_size', 10))
+        except ValueError:
+            return Response({'error': 'Invalid value for page_size. Must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        if page_size < 1:
+            return Response({'error': 'page_size must be a positive integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        page_size = min(page_size, settings.REVIEWS_MAX_PAGE_SIZE)
+
+        try:
+            page = CursorPaginator(reviews, keys, page_size).page(request.query_params.get('cursor'))
+        except InvalidCursor as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-    
-        
-    # Create a new review (customer users only).
+
+        serializer = ReviewSerializer(page.object_list, many=True, **fieldset)
+
+        url = request.build_absolute_uri()
+        return Response({
+            'next': replace_query_param(url, 'cursor', page.next_cursor) if page.next_cursor else None,
+            'previous': replace_query_param(url, 'cursor', page.previous_cursor) if page.previous_cursor else None,
+            'results': serializer.data
+        }, status=status.HTTP_200_OK)
+
+    # Create a new review (customer users only); validation and permission errors go through DRF's exception handler.
     def post(self, request):
         serializer = ReviewSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        review = serializer.save()
+        return Response(ReviewSerializer(review).data, status=status.HTTP_201_CREATED)
+
+"""Columns of the review export, in order."""
+REVIEW_EXPORT_COLUMNS = ['id', 'business_user', 'reviewer', 'rating', 'description', 'created_at', 'updated_at']
+
+"""Stream the requesting user's reviews as CSV or NDJSON."""
+class ReviewExportView(ExportMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    # Export the user's reviews (received or written; filtered by business_user_id and reviewer_id) in id order with constant memory.
+    def get(self, request):
+        export_format = get_export_format(request)
+        if export_format is None:
+            return Response({'error': f'Invalid value for format. Must be one of {", ".join(EXPORT_FORMATS)}.'}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
-            if serializer.is_valid(raise_exception=True):
-                review = serializer.save()
-                return Response(ReviewSerializer(review).data, status=status.HTTP_201_CREATED)
-            
-        except ValidationError as e:
-            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
-        
-        except PermissionDenied as e:
-            return Response({'detail': str(e)}, status=status.HTTP_403_FORBIDDEN)
-        
-        except Exception as e:
-            return Response({'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            reviews = apply_review_filters(reviews_for_user(request.user), request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = iterate_rows(reviews.order_by('id').values_list(*REVIEW_EXPORT_COLUMNS))
+        return stream_export(rows, REVIEW_EXPORT_COLUMNS, export_format, 'reviews')
+
+"""Get the rating summary of a business user."""
+class BusinessRatingSummaryView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    # Return review count, average rating and star histogram of a business user in one query.
+    def get(self, request, business_user_id):
+        account = get_object_or_404(Account.objects.select_related('rating_summary'), id=business_user_id)
+        if account.user_type != Account.BUSINESS:
+            return Response({"detail": "This user is not a business user."}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = BusinessRatingSummarySerializer(rating_summary_of(account), context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
 """Update or delete a single review."""
 class ReviewSingleView(APIView):
     permission_classes = [IsAuthenticated]
 
     # Update a review by ID (reviewer only).
+    # The row stays locked until the save, so concurrent re-ratings move the histogram from the committed rating.
     def patch(self, request, id):
-        try:
-            review = Review.objects.get(pk=id)
-        except Review.DoesNotExist:
-            return Response({"detail": f"Review with ID {id} not found."}, status=status.HTTP_404_NOT_FOUND)
+        with transaction.atomic():
+            try:
+                review = Review.objects.select_for_update().get(pk=id)
+            except Review.DoesNotExist:
+                return Response({"detail": f"Review with ID {id} not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        if request.user.id != review.reviewer_id:
-            return Response({"detail": "Only the reviewer can update this review."}, status=status.HTTP_403_FORBIDDEN)     
-        serializer = ReviewSinglePatchSerializer(review, data=request.data, partial=True, context={'request': request})
+            if request.user.id != review.reviewer_id:
+                return Response({"detail": "Only the reviewer can update this review."}, status=status.HTTP_403_FORBIDDEN)
+            serializer = ReviewSinglePatchSerializer(review, data=request.data, partial=True, context={'request': request})
 
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            if serializer.is_valid():
+                serializer.save()
+                return Response(serializer.data, status=status.HTTP_200_OK)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     # Delete a review by ID (reviewer only).
+    # The lock makes a concurrent or retried delete wait and then find no review, so the summary is adjusted once.
     def delete(self, request, id):
-        try:
-            review = Review.objects.get(pk=id)
-        except Review.DoesNotExist:
-            return Response({"detail": "Review not found."}, status=status.HTTP_404_NOT_FOUND)
+        with transaction.atomic():
+            try:
+                review = Review.objects.select_for_update().get(pk=id)
+            except Review.DoesNotExist:
+                return Response({"detail": "Review not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        if request.user.id != review.reviewer_id:
-            return Response({"detail": "Only the reviewer can delete this review."}, status=status.HTTP_403_FORBIDDEN)
+            if request.user.id != review.reviewer_id:
+                return Response({"detail": "Only the reviewer can delete this review."}, status=status.HTTP_403_FORBIDDEN)
 
-        review.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+            review.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
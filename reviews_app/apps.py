@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ReviewsAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews_app'
+
+    def ready(self):
+        from reviews_app import signals  # noqa: F401
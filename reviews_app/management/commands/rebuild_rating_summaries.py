@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from reviews_app.models import RATING_STARS, BusinessRatingSummary, aggregate_ratings_by_business, average_of, star_field
+
+"""Rebuild or verify the per-business rating summaries."""
+class Command(BaseCommand):
+    help = "Recompute BusinessRatingSummary (review count, rating sum, star histogram, average) from the reviews table."
+
+    # Register command line options.
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help="Only report businesses whose summaries are out of date.")
+
+    # Run the rebuild or the verification.
+    def handle(self, *args, **options):
+        if options['verify']:
+            self.verify()
+        else:
+            count = BusinessRatingSummary.objects.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt rating summaries of {count} business users."))
+
+    # Compare the stored summaries with fresh aggregates.
+    def verify(self):
+        fields = ['review_count', 'rating_sum', *[star_field(stars) for stars in RATING_STARS]]
+        empty = (0,) * len(fields) + (None,)
+        expected = {
+            row['business_user']: tuple(row[field] or 0 for field in fields) + (average_of(row['rating_sum'], row['review_count']),)
+            for row in aggregate_ratings_by_business()
+        }
+        stored = {
+            row[0]: tuple(row[1:])
+            for row in BusinessRatingSummary.objects.values_list('business_user', *fields, 'average_rating')
+        }
+
+        stale = [
+            business_user_id for business_user_id in expected.keys() | stored.keys()
+            if expected.get(business_user_id, empty) != stored.get(business_user_id, empty)
+        ]
+        for business_user_id in sorted(stale):
+            self.stdout.write(f"Business user {business_user_id}: stored {stored.get(business_user_id)}, expected {expected.get(business_user_id)}")
+        if stale:
+            self.stdout.write(self.style.WARNING(f"{len(stale)} business users have stale rating summaries."))
+        else:
+            self.stdout.write(self.style.SUCCESS("All rating summaries are up to date."))
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def check_duplicate_reviews(apps, schema_editor):
+    Review = apps.get_model("reviews_app", "Review")
+    duplicates = list(
+        Review.objects.values("reviewer_id", "business_user_id")
+        .annotate(count=models.Count("id"))
+        .filter(count__gt=1)
+        .values_list("reviewer_id", "business_user_id")[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Reviewers with more than one review of the same business must be cleaned up "
+            f"before migrating (reviewer_id, business_user_id): {duplicates}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews_app", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="review",
+            name="business_user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="business_user_review",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="review",
+            name="reviewer",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="given_reviews",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["business_user", "updated_at"], name="review_business_updated"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["business_user", "rating"], name="review_business_rating"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["reviewer", "updated_at"], name="review_reviewer_updated"
+            ),
+        ),
+        migrations.RunPython(check_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="review",
+            constraint=models.UniqueConstraint(
+                fields=("reviewer", "business_user"), name="unique_review_per_business"
+            ),
+        ),
+    ]
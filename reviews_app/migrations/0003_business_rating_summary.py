@@ -0,0 +1,89 @@
+# Generated by Django 5.2.3 on 2026-10-18 20:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import migrations, models
+
+
+def backfill_rating_summaries(apps, schema_editor):
+    Review = apps.get_model("reviews_app", "Review")
+    BusinessRatingSummary = apps.get_model("reviews_app", "BusinessRatingSummary")
+    rows = (
+        Review.objects.order_by()
+        .values("business_user")
+        .annotate(
+            review_count=models.Count("pk"),
+            rating_sum=models.Sum("rating"),
+            **{
+                f"rating_{stars}_count": models.Count(
+                    "pk", filter=models.Q(rating=stars)
+                )
+                for stars in range(1, 6)
+            },
+        )
+    )
+    BusinessRatingSummary.objects.bulk_create(
+        [
+            BusinessRatingSummary(
+                business_user_id=row["business_user"],
+                review_count=row["review_count"],
+                rating_sum=row["rating_sum"] or 0,
+                average_rating=(
+                    Decimal(row["rating_sum"] or 0) / row["review_count"]
+                ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
+                **{
+                    f"rating_{stars}_count": row[f"rating_{stars}_count"]
+                    for stars in range(1, 6)
+                },
+            )
+            for row in rows
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth_app", "0001_initial"),
+        ("reviews_app", "0002_review_indexes_unique"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BusinessRatingSummary",
+            fields=[
+                (
+                    "business_user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rating_summary",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("review_count", models.PositiveIntegerField(default=0)),
+                ("rating_sum", models.PositiveIntegerField(default=0)),
+                ("rating_1_count", models.PositiveIntegerField(default=0)),
+                ("rating_2_count", models.PositiveIntegerField(default=0)),
+                ("rating_3_count", models.PositiveIntegerField(default=0)),
+                ("rating_4_count", models.PositiveIntegerField(default=0)),
+                ("rating_5_count", models.PositiveIntegerField(default=0)),
+                (
+                    "average_rating",
+                    models.DecimalField(
+                        blank=True,
+                        db_index=True,
+                        decimal_places=2,
+                        max_digits=3,
+                        null=True,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(backfill_rating_summaries, migrations.RunPython.noop),
+    ]
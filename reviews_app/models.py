@@ -1,12 +1,153 @@
-from django.db import models
+from collections import Counter
+from decimal import ROUND_HALF_UP, Decimal
+from django.db import models, transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Q, Sum, Value
+from django.db.models.functions import Cast, Greatest, NullIf
+from django.utils import timezone
 from auth_app.models import Account
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+"""Star ratings counted in the rating histogram."""
+RATING_STARS = range(1, 6)
+
 """Model for user reviews of business users."""
 class Review(models.Model):
-    business_user = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='business_user_review', blank=False, null=False)
-    reviewer = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='given_reviews')
+    # Both foreign keys lead composite indexes below, so they need no single-column index of their own.
+    business_user = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='business_user_review', blank=False, null=False, db_index=False)
+    reviewer = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='given_reviews', db_index=False)
     rating = models.PositiveIntegerField(default=0, validators=[MinValueValidator(1), MaxValueValidator(5)])
     description = models.TextField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
\ No newline at end of file
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'updated_at'], name='review_business_updated'),
+            models.Index(fields=['business_user', 'rating'], name='review_business_rating'),
+            models.Index(fields=['reviewer', 'updated_at'], name='review_reviewer_updated'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['reviewer', 'business_user'], name='unique_review_per_business'),
+        ]
+
+    # Remember the loaded business and rating so the summary signals can tell what changed on save.
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_rating_key = instance.rating_key()
+        return instance
+
+    # The (business user id, rating) pair a review is counted under in BusinessRatingSummary.
+    def rating_key(self):
+        return self.__dict__.get('business_user_id'), self.__dict__.get('rating')
+
+    # Save the review and, through the signals, its rating summary in one transaction.
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+    # Delete the review and update its rating summary in one transaction.
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            return super().delete(*args, **kwargs)
+
+
+# Name of the histogram column for a star rating.
+def star_field(stars):
+    return f'rating_{stars}_count'
+
+
+# Aggregate the reviews of every business user into rows keyed by the BusinessRatingSummary fields.
+def aggregate_ratings_by_business():
+    return Review.objects.order_by().values('business_user').annotate(
+        review_count=Count('pk'),
+        rating_sum=Sum('rating'),
+        **{star_field(stars): Count('pk', filter=Q(rating=stars)) for stars in RATING_STARS}
+    )
+
+
+# Average rating rounded like PostgreSQL rounds numeric values (half away from zero), or None without reviews.
+def average_of(rating_sum, review_count):
+    if not review_count:
+        return None
+    return (Decimal(rating_sum or 0) / review_count).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+"""Queryset helpers that keep the rating summaries in step with review writes."""
+class BusinessRatingSummaryQuerySet(models.QuerySet):
+
+    # Apply rating deltas given as [(business_user_id, rating, delta), ...] with one UPDATE per business.
+    def adjust(self, changes):
+        per_business = {}
+        for business_user_id, rating, delta in changes:
+            if delta:
+                per_business.setdefault(business_user_id, Counter())[rating] += delta
+
+        for business_user_id, deltas in per_business.items():
+            count_delta = sum(deltas.values())
+            sum_delta = sum(rating * delta for rating, delta in deltas.items())
+            review_count = Greatest(F('review_count') + count_delta, 0)
+            rating_sum = Greatest(F('rating_sum') + sum_delta, 0)
+            updates = {
+                'review_count': review_count,
+                'rating_sum': rating_sum,
+                # Computed from the same expressions, so the average matches the new count and sum in one statement.
+                'average_rating': ExpressionWrapper(
+                    Cast(rating_sum, DecimalField(max_digits=12, decimal_places=4)) / NullIf(review_count, Value(0)),
+                    output_field=DecimalField(max_digits=3, decimal_places=2)
+                ),
+                'updated_at': timezone.now(),
+                **{
+                    star_field(rating): Greatest(F(star_field(rating)) + delta, 0)
+                    for rating, delta in deltas.items() if delta and rating in RATING_STARS
+                },
+            }
+            if self.filter(pk=business_user_id).update(**updates):
+                continue
+            # No summary row yet: create it on increments only (see OrderStatsQuerySet.adjust).
+            if count_delta > 0:
+                self.get_or_create(business_user_id=business_user_id)
+                self.filter(pk=business_user_id).update(**updates)
+
+    # Recompute all summaries from the reviews table in one transaction; returns the number of summary rows.
+    def rebuild(self):
+        now = timezone.now()
+        summaries = [
+            self.model(
+                business_user_id=row['business_user'],
+                review_count=row['review_count'],
+                rating_sum=row['rating_sum'] or 0,
+                average_rating=average_of(row['rating_sum'], row['review_count']),
+                updated_at=now,
+                **{star_field(stars): row[star_field(stars)] for stars in RATING_STARS}
+            )
+            for row in aggregate_ratings_by_business()
+        ]
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(summaries)
+        return len(summaries)
+
+
+"""Review count, rating sum, star histogram and average rating of a business user, maintained by the review signals."""
+class BusinessRatingSummary(models.Model):
+    business_user = models.OneToOneField(Account, on_delete=models.CASCADE, primary_key=True, related_name='rating_summary')
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    average_rating = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True, db_index=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    objects = BusinessRatingSummaryQuerySet.as_manager()
+
+    # Return the business user id the summary belongs to.
+    def __str__(self):
+        return f'Rating summary of {self.business_user_id}'
+
+    # Map each star rating to its number of reviews.
+    def histogram(self):
+        return {str(stars): getattr(self, star_field(stars)) for stars in RATING_STARS}
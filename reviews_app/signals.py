@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from reviews_app.models import BusinessRatingSummary, Review
+
+# Count new reviews and move re-rated ones within the histogram.
+@receiver(post_save, sender=Review)
+def summarize_saved_review(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = instance.rating_key()
+    previous = getattr(instance, '_loaded_rating_key', None)
+
+    if created:
+        BusinessRatingSummary.objects.adjust([(*current, 1)])
+    elif previous is not None and previous != current:
+        BusinessRatingSummary.objects.adjust([(*previous, -1), (*current, 1)])
+    instance._loaded_rating_key = current
+
+# Deleted reviews are taken out of the summary with the rating they were stored with.
+@receiver(post_delete, sender=Review)
+def summarize_deleted_review(sender, instance, **kwargs):
+    previous = getattr(instance, '_loaded_rating_key', None) or instance.rating_key()
+    BusinessRatingSummary.objects.adjust([(*previous, -1)])
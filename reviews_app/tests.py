@@ -0,0 +1,91 @@
+import csv
+import io
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from auth_app.models import Account
+from reviews_app.models import BusinessRatingSummary, Review
+
+"""Changing and deleting a review adjusts the business user's rating summary exactly once."""
+class ReviewSummaryTests(TestCase):
+
+    def setUp(self):
+        self.business = Account.objects.create_user(username='business', password='secret-pw-123', user_type=Account.BUSINESS)
+        reviewer = Account.objects.create_user(username='customer', password='secret-pw-123', user_type=Account.CUSTOMER)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=reviewer).key}')
+        self.review = Review.objects.create(business_user=self.business, reviewer=reviewer, rating=4)
+
+    # Return the rating summary of the business user as served by the API.
+    def summary(self):
+        return self.client.get(f'/api/rating-summary/{self.business.pk}/').data
+
+    # Output of rebuild_rating_summaries --verify.
+    def verify_output(self):
+        output = io.StringIO()
+        call_command('rebuild_rating_summaries', verify=True, stdout=output)
+        return output.getvalue()
+
+    def test_repeated_delete_counts_the_review_down_once(self):
+        first = self.client.delete(f'/api/reviews/{self.review.pk}/')
+        second = self.client.delete(f'/api/reviews/{self.review.pk}/')
+
+        self.assertEqual((first.status_code, second.status_code), (204, 404))
+        summary = self.summary()
+        self.assertEqual(summary['review_count'], 0)
+        self.assertEqual(summary['rating_counts'], {str(rating): 0 for rating in range(1, 6)})
+
+    def test_rerating_moves_the_review_between_buckets(self):
+        for rating in (5, 2):
+            response = self.client.patch(f'/api/reviews/{self.review.pk}/', {'rating': rating}, format='json')
+            self.assertEqual(response.status_code, 200)
+
+        summary = self.summary()
+        self.assertEqual(summary['review_count'], 1)
+        self.assertEqual(summary['average_rating'], 2.0)
+        self.assertEqual(summary['rating_counts'], {'1': 0, '2': 1, '3': 0, '4': 0, '5': 0})
+
+    def test_created_review_is_counted_and_verify_passes(self):
+        reviewer = Account.objects.create_user(username='second', password='secret-pw-123', user_type=Account.CUSTOMER)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=reviewer).key}')
+        response = client.post('/api/reviews/', {'business_user': self.business.pk, 'rating': 2, 'description': 'Late'}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        summary = self.summary()
+        self.assertEqual(summary['review_count'], 2)
+        self.assertEqual(summary['average_rating'], 3.0)
+        self.assertIn('up to date', self.verify_output())
+
+    def test_verify_reports_and_rebuild_repairs_drift(self):
+        BusinessRatingSummary.objects.filter(business_user=self.business).update(review_count=7)
+        self.assertIn('stale rating summaries', self.verify_output())
+
+        call_command('rebuild_rating_summaries', stdout=io.StringIO())
+        self.assertEqual(self.summary()['review_count'], 1)
+        self.assertIn('up to date', self.verify_output())
+
+
+"""The review export only contains the user's reviews and never emits spreadsheet formulas."""
+class ReviewExportTests(TestCase):
+
+    def setUp(self):
+        reviewer = Account.objects.create_user(username='customer', password='secret-pw-123', user_type=Account.CUSTOMER)
+        other = Account.objects.create_user(username='other', password='secret-pw-123', user_type=Account.CUSTOMER)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=reviewer).key}')
+        for index, description in enumerate(('=HYPERLINK("http://evil")', '+1', '-1', '@SUM(A1)', '\tcmd', '\rcmd', 'fine')):
+            business = Account.objects.create_user(username=f'business{index}', password='secret-pw-123', user_type=Account.BUSINESS)
+            Review.objects.create(business_user=business, reviewer=reviewer, rating=3, description=description)
+        Review.objects.create(business_user=business, reviewer=other, rating=1, description='not mine')
+
+    # Return the exported CSV as a list of dicts.
+    def export_rows(self):
+        response = self.client.get('/api/reviews/export/?format=csv')
+        self.assertEqual(response.status_code, 200)
+        return list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_formula_cells_are_escaped(self):
+        descriptions = [row['description'] for row in self.export_rows()]
+        self.assertEqual(descriptions, ["'=HYPERLINK(\"http://evil\")", "'+1", "'-1", "'@SUM(A1)", "'\tcmd", "'\rcmd", 'fine'])
@@ -0,0 +1,116 @@
+import os
+from contextlib import contextmanager
+from django.apps import apps
+from django.conf import settings
+from django.http import UnreadablePostError
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, PermissionDenied
+from core.images import is_valid_image, schedule_variants
+from core.uploads import LocalUploadedFile, UploadTooLarge
+from offers_app.cache import bump_offers_version
+from uploads_app.models import UPLOAD_TARGETS, UploadSession
+
+try:
+    import fcntl
+except ImportError:
+    # Without flock (Windows) concurrent chunks are only told apart by the offset check.
+    fcntl = None
+
+"""Request header with the offset a chunk starts at; responses report the received offset in it."""
+UPLOAD_OFFSET_HEADER = 'Upload-Offset'
+
+"""Response header with the declared total size of the upload."""
+UPLOAD_LENGTH_HEADER = 'Upload-Length'
+
+"""Callbacks run after the image variants of a target have been generated."""
+VARIANT_CALLBACKS = {'offer_image': bump_offers_version}
+
+"""Another request is appending to the same upload; answered with 409."""
+class ChunkInProgress(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Another chunk of this upload is being received.'
+    default_code = 'chunk_in_progress'
+
+
+# Hold an exclusive lock on the partial file while one request appends to it; a second request fails at once.
+@contextmanager
+def chunk_lock(session):
+    os.makedirs(settings.UPLOAD_PARTIAL_DIR, exist_ok=True)
+    with open(session.partial_path(), 'ab') as partial:
+        if fcntl is not None:
+            try:
+                fcntl.flock(partial, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise ChunkInProgress()
+        yield
+
+# Load the object an upload targets with its file field name; 404 when missing, 403 for other users' objects.
+def get_upload_target(target, object_id, user):
+    model_label, field_name = UPLOAD_TARGETS[target]
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=object_id).first()
+    name = model._meta.verbose_name
+    if instance is None:
+        raise NotFound(f'{name.capitalize()} not found.')
+    if instance.user_id != user.id:
+        raise PermissionDenied(f'Only the owner can upload a file to this {name}.')
+    return instance, field_name
+
+# Clamp the stored offset to the bytes on disk (e.g. after the partial file was lost), so clients resume from there.
+def sync_offset(session):
+    try:
+        on_disk = os.path.getsize(session.partial_path())
+    except FileNotFoundError:
+        on_disk = 0
+    if on_disk < session.offset:
+        session.offset = on_disk
+        session.save(update_fields=['offset', 'updated_at'])
+
+# Append the request body at the session offset; returns the bytes written and whether the body ended early.
+def append_chunk(session, stream, content_length):
+    remaining = session.size - session.offset
+    if content_length is not None and content_length > remaining:
+        raise UploadTooLarge('The chunk exceeds the declared upload size.')
+
+    written = 0
+    with open(session.partial_path(), 'ab') as partial:
+        # Bytes past the stored offset come from a request that failed before its offset was saved.
+        partial.truncate(session.offset)
+        while stream is not None:
+            limit = settings.UPLOAD_CHUNK_SIZE if content_length is None else min(settings.UPLOAD_CHUNK_SIZE, content_length - written)
+            if limit <= 0:
+                return written, False
+            try:
+                data = stream.read(limit)
+            except UnreadablePostError:
+                return written, True
+            if not data:
+                return written, content_length is not None and written < content_length
+            # Without a Content-Length the first bytes past the declared size end the upload.
+            if written + len(data) > remaining:
+                raise UploadTooLarge('The chunk exceeds the declared upload size.')
+            partial.write(data)
+            written += len(data)
+    return written, False
+
+# Move a completed upload into the target's file field and schedule its variants; returns the field file,
+# or None when an offer image is not a valid image. The session row is deleted either way.
+def finish_upload(session, user):
+    instance, field_name = get_upload_target(session.target, session.object_id, user)
+    path = session.partial_path()
+    if session.target == 'offer_image' and not is_valid_image(path):
+        session.discard_partial()
+        UploadSession.objects.filter(pk=session.pk).delete()
+        return None
+
+    field_file = getattr(instance, field_name)
+    upload = LocalUploadedFile(path, session.filename)
+    try:
+        field_file.save(session.filename, upload, save=True)
+    finally:
+        upload.close()
+    # Storages that copy instead of moving leave the partial file behind.
+    session.discard_partial()
+    UploadSession.objects.filter(pk=session.pk).delete()
+    schedule_variants(field_file, on_done=VARIANT_CALLBACKS.get(session.target))
+    return field_file
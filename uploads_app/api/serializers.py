@@ -0,0 +1,46 @@
+import os
+from django.conf import settings
+from rest_framework import serializers
+from core.images import is_image_name
+from core.uploads import UploadTooLarge
+from uploads_app.models import UploadSession
+from .chunks import get_upload_target
+
+"""Serializer for starting and reporting resumable uploads."""
+class UploadSessionSerializer(serializers.ModelSerializer):
+    complete = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'target', 'object_id', 'filename', 'size', 'offset', 'complete', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'offset', 'created_at', 'updated_at']
+
+    # Whether all bytes have been received.
+    def get_complete(self, obj):
+        return obj.is_complete()
+
+    # Reject empty files, and files over the limit before any byte is sent.
+    def validate_size(self, value):
+        if value < 1:
+            raise serializers.ValidationError("The file must not be empty.")
+        if value > settings.UPLOAD_MAX_FILE_SIZE:
+            raise UploadTooLarge()
+        return value
+
+    # Keep only the base name of the client's file name.
+    def validate_filename(self, value):
+        name = os.path.basename(value.replace('\\', '/')).strip()
+        if not name:
+            raise serializers.ValidationError("Enter a valid file name.")
+        return name
+
+    # Only the owner of the profile or offer may upload; offer images must have an image file name.
+    def validate(self, data):
+        if data['target'] == 'offer_image' and not is_image_name(data['filename']):
+            raise serializers.ValidationError({'filename': "Offer images must be image files."})
+        get_upload_target(data['target'], data['object_id'], self.context['request'].user)
+        return data
+
+    # Create the session for the requesting user.
+    def create(self, validated_data):
+        return UploadSession.objects.create(user=self.context['request'].user, **validated_data)
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import UploadSessionDetailView, UploadSessionsView
+
+""" URL patterns for resumable file uploads. """
+urlpatterns = [
+    path('upload-sessions/', UploadSessionsView.as_view()),
+    path('upload-sessions/<uuid:pk>/', UploadSessionDetailView.as_view())
+]
@@ -0,0 +1,93 @@
+from django.db import DatabaseError, transaction
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from uploads_app.models import UploadSession
+from .chunks import UPLOAD_LENGTH_HEADER, UPLOAD_OFFSET_HEADER, ChunkInProgress, append_chunk, chunk_lock, finish_upload, sync_offset
+from .serializers import UploadSessionSerializer
+
+# Response with the session state, its offset and size mirrored in the Upload-Offset/Upload-Length headers.
+def session_response(session, status_code=status.HTTP_200_OK, **extra):
+    response = Response({**UploadSessionSerializer(session).data, **extra}, status=status_code)
+    response[UPLOAD_OFFSET_HEADER] = str(session.offset)
+    response[UPLOAD_LENGTH_HEADER] = str(session.size)
+    response['Cache-Control'] = 'no-store'
+    return response
+
+"""Start a resumable upload of a profile file or an offer image."""
+class UploadSessionsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    # Create an upload session for {target, object_id, filename, size}; oversized files are rejected with 413.
+    def post(self, request):
+        serializer = UploadSessionSerializer(data=request.data, context={'request': request})
+        if serializer.is_valid():
+            session = serializer.save()
+            return session_response(session, status.HTTP_201_CREATED)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+"""Report the progress of an upload or append the next chunk of raw bytes to it."""
+class UploadSessionDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    # Return the received offset to resume from (HEAD returns the headers only).
+    def get(self, request, pk):
+        session = UploadSession.objects.filter(pk=pk, user=request.user).first()
+        if session is None:
+            return Response({"detail": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        sync_offset(session)
+        return session_response(session)
+
+    # Append the request body at Upload-Offset; the last chunk moves the file into the profile or offer.
+    def patch(self, request, pk):
+        try:
+            offset = int(request.headers.get(UPLOAD_OFFSET_HEADER, ''))
+        except ValueError:
+            return Response({"detail": f"The {UPLOAD_OFFSET_HEADER} header must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or '')
+        except ValueError:
+            content_length = None
+
+        session = UploadSession.objects.filter(pk=pk, user=request.user).first()
+        if session is None:
+            return Response({"detail": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        # The file lock claims the upload while the body is streamed; no database transaction stays open meanwhile.
+        with chunk_lock(session):
+            return self.receive_chunk(request, session, offset, content_length)
+
+    # Check the offset against the committed session, append the chunk and store the new offset.
+    def receive_chunk(self, request, session, offset, content_length):
+        with transaction.atomic():
+            try:
+                # Own savepoint, so a lock conflict leaves the outer transaction usable.
+                with transaction.atomic():
+                    locked = UploadSession.objects.select_for_update(nowait=True).filter(pk=session.pk).first()
+            except DatabaseError:
+                raise ChunkInProgress()
+            if locked is None:
+                # Finished or purged since it was loaded; drop the partial file the lock created.
+                session.discard_partial()
+                return Response({"detail": "Upload not found."}, status=status.HTTP_404_NOT_FOUND)
+            session = locked
+
+            sync_offset(session)
+            if offset != session.offset:
+                return session_response(session, status.HTTP_409_CONFLICT, detail=f"{UPLOAD_OFFSET_HEADER} must match the received offset.")
+
+        written, interrupted = append_chunk(session, request.stream, content_length)
+        session.offset += written
+        session.save(update_fields=['offset', 'updated_at'])
+        if interrupted:
+            return session_response(session, status.HTTP_400_BAD_REQUEST, detail="The chunk ended early; resume from Upload-Offset.")
+        if not session.is_complete():
+            return session_response(session)
+
+        field_file = finish_upload(session, request.user)
+        if field_file is None:
+            return Response({"detail": "Upload a valid image. The file you uploaded was either not an image or a corrupted image."}, status=status.HTTP_400_BAD_REQUEST)
+        return session_response(session, file=field_file.url)
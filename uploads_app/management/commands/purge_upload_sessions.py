@@ -0,0 +1,22 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from uploads_app.models import UploadSession
+
+"""Delete abandoned resumable uploads together with their partial files."""
+class Command(BaseCommand):
+    help = "Delete upload sessions without progress for UPLOAD_SESSION_TTL_HOURS (or --older-than-hours)."
+
+    # Register command line options.
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-hours', type=int, default=settings.UPLOAD_SESSION_TTL_HOURS, help="Hours without a received chunk after which sessions are deleted.")
+
+    # Delete the stale sessions and their partial files.
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['older_than_hours'])
+        sessions = list(UploadSession.objects.filter(updated_at__lt=cutoff))
+        for session in sessions:
+            session.discard_partial()
+        UploadSession.objects.filter(pk__in=[session.pk for session in sessions]).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {len(sessions)} upload sessions."))
@@ -0,0 +1,44 @@
+import os
+import uuid
+from django.conf import settings
+from django.db import models
+from auth_app.models import Account
+
+"""File fields that accept resumable uploads: target name -> (model label, field name)."""
+UPLOAD_TARGETS = {
+    'profile_file': ('profile_app.Profile', 'file'),
+    'offer_image': ('offers_app.Offer', 'image'),
+}
+
+"""A resumable upload into a profile file or offer image; received bytes are appended at offset until size is reached."""
+class UploadSession(models.Model):
+    TARGET_CHOICES = [(target, target) for target in UPLOAD_TARGETS]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(Account, on_delete=models.CASCADE, related_name='upload_sessions')
+    target = models.CharField(max_length=32, choices=TARGET_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    # Return the file name and progress.
+    def __str__(self):
+        return f'{self.filename} ({self.offset}/{self.size})'
+
+    # Path of the partially received file in UPLOAD_PARTIAL_DIR.
+    def partial_path(self):
+        return os.path.join(settings.UPLOAD_PARTIAL_DIR, f'{self.pk}.part')
+
+    # Whether all bytes have been received.
+    def is_complete(self):
+        return self.offset >= self.size
+
+    # Remove the partial file, if any.
+    def discard_partial(self):
+        try:
+            os.remove(self.partial_path())
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from auth_app.models import Account
+from profile_app.models import Profile
+from uploads_app.models import UploadSession
+
+"""Resumable uploads accept chunks only at the received offset and can be resumed until the file is complete."""
+class ResumableUploadTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        paths = override_settings(UPLOAD_PARTIAL_DIR=os.path.join(directory, 'partial'), MEDIA_ROOT=os.path.join(directory, 'media'))
+        paths.enable()
+        self.addCleanup(paths.disable)
+
+        self.account = Account.objects.create_user(username='business', password='secret-pw-123', user_type=Account.BUSINESS)
+        self.profile = Profile.objects.create(user=self.account)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.account).key}')
+        self.content = b'%PDF-1.4 resumable upload'
+        response = self.client.post('/api/upload-sessions/', {
+            'target': 'profile_file', 'object_id': self.profile.pk, 'filename': 'cv.pdf', 'size': len(self.content)
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.url = f"/api/upload-sessions/{response.data['id']}/"
+
+    # Send a chunk starting at the given offset.
+    def send(self, chunk, offset):
+        return self.client.patch(self.url, chunk, content_type='application/offset+octet-stream', headers={'Upload-Offset': str(offset)})
+
+    def test_chunk_at_another_offset_is_rejected(self):
+        self.assertEqual(self.send(self.content[:10], 0).status_code, 200)
+
+        for offset in (0, 5, 20):
+            response = self.send(self.content[10:], offset)
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response['Upload-Offset'], '10')
+        self.assertEqual(UploadSession.objects.get().offset, 10)
+
+    def test_partial_upload_is_resumed_from_the_received_offset(self):
+        response = self.send(self.content[:10], 0)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['complete'])
+
+        progress = self.client.get(self.url)
+        self.assertEqual(progress.data['offset'], 10)
+        self.assertFalse(progress.data['complete'])
+
+        response = self.send(self.content[10:], 10)
+        self.assertEqual(response.status_code, 200)
+        self.profile.refresh_from_db()
+        with self.profile.file.open('rb') as stored:
+            self.assertEqual(stored.read(), self.content)
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_lost_partial_bytes_are_requested_again(self):
+        self.send(self.content[:10], 0)
+        with open(UploadSession.objects.get().partial_path(), 'r+b') as partial:
+            partial.truncate(4)
+
+        self.assertEqual(self.client.get(self.url).data['offset'], 4)
+        self.assertEqual(self.send(self.content[10:], 10).status_code, 409)
+        self.assertEqual(self.send(self.content[4:], 4).status_code, 200)
+        self.profile.refresh_from_db()
+        with self.profile.file.open('rb') as stored:
+            self.assertEqual(stored.read(), self.content)
+
+    def test_other_users_cannot_see_or_continue_the_upload(self):
+        other = Account.objects.create_user(username='other', password='secret-pw-123', user_type=Account.BUSINESS)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=other).key}')
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.send(self.content, 0).status_code, 404)